@@ -1,20 +1,49 @@
-from flask import Flask, send_from_directory, render_template, jsonify, request , make_response
+from flask import Flask, send_from_directory, render_template, jsonify, request , make_response, g, Response
 from flask_compress import Compress
 from apscheduler.schedulers.background import BackgroundScheduler
-from datetime import datetime
-from collections import defaultdict
+from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED
 import os
 import json
+import tempfile
+import threading
 import time
-from model.SQLiteManager import SQLiteManagerSQL
-from model.OracleManagerSQL import OracleManagerSQL
+from datetime import datetime
+from model.SQLiteManager import SQLiteManagerSQL, db_path, pool as sqlite_pool
+from model.SQLiteConnectionPool import SQLiteConnectionPool
+from model.SQLiteReplica import SQLiteReplica, ReplicaStateReader
+from model.SQLiteSchema import ensure_indexes
+from model.OracleManagerSQL import OracleManagerSQL, pool as oracle_pool, DB_DSN
+from service.ChangeWatcher import ChangeWatcher
+from service.SnapshotWriter import SnapshotWriter, SnapshotManifest, is_hashed_snapshot
+from service.RefreshLeader import RefreshLeader
+from service.PageCache import RenderedPageCache, static_asset_url
+from service.HttpCache import NO_STORE, REVALIDATE, IMMUTABLE, version_etag, not_modified, set_validators
+from service.SearchCache import SearchResultCache, normalize_keyword
+from service.Admission import SingleFlight, ConcurrencyLimiter, Overloaded
+from service.Cursor import encode_cursor, decode_cursor
+from service.ReportCache import IncrementalGroupedCache, ReportSnapshotBuilder, SNAPSHOT_FORMAT_VERSION
+from service.ReportTransform import save_time_date, reg_dt_date, is_global_report, group_reports, group_report_objects, make_report
+from service.GlobalIndex import GLOBAL_INDEX_NAME, GlobalIndexReader, build_index_snapshot
+from service.ReportFeed import ReportFeed, sse_retry
+from service.JsonProvider import FastJSONProvider
+from service.Metrics import (
+    REQUEST_DURATION, CACHE_REQUESTS, CACHE_REFRESHES, CACHE_REFRESH_DURATION, CACHE_UPDATES, CACHE_LAST_REFRESH,
+    REFRESH_LEADER, REPLICA_ROWS, REPLICA_SOURCE_LAG, REPLICA_LAST_SYNC, STARTUP_DURATION,
+    SEARCH_ADMISSIONS, SEARCH_QUEUE_WAIT,
+    observe_scheduler_event, render_metrics,
+)
 from dotenv import load_dotenv
 
 # 환경 변수 로드
 load_dotenv()
 
+# 워커 기동 시간 측정 (import 이후 요청을 받을 수 있을 때까지)
+startup_started = time.perf_counter()
+
 # Flask 앱 초기화
 app = Flask(__name__)
+# jsonify 응답을 orjson 으로 bytes 직렬화 (없으면 표준 json)
+app.json = FastJSONProvider(app)
 Compress(app)
 
 # CSP 설정
@@ -26,153 +55,342 @@ csp = {
 
 scheduler = BackgroundScheduler()
 
-# 캐시 초기화
-cache_recent_reports = {"data": None, "last_modified": None}
-cache_grouped_reports = {"data": None, "last_modified": None}
-cache_recent_global_reports = {"data": None, "last_modified": None}
-
 # JSON 파일 저장 디렉토리 생성
 static_folder = os.path.join(os.getcwd(), 'static', 'reports')
 os.makedirs(static_folder, exist_ok=True)
 
-def save_json_to_file(filename, data):
-    """데이터를 JSON 파일로 저장"""
-    file_path = os.path.join(static_folder, filename)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        # json.dump(data, f, ensure_ascii=False, indent=4)
-        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
-
-    print(f"[JSON 저장 완료] {file_path}")
-
-def update_cache_recent_reports():
-    """최근 레포트 캐시 갱신 및 JSON 파일 저장"""
-    db = SQLiteManagerSQL()
-    last_modified_time = db.fetch_last_modified_time()
-
-    if cache_recent_reports["last_modified"] == last_modified_time:
-        print("[최근 레포트] 데이터 변경 없음. 캐시를 사용합니다.")
-        db.close_connection()
-        return
-
-    print("[최근 레포트] 데이터 변경 감지. 캐시를 갱신합니다.")
-    rows = db.fetch_articles_by_todate()
-    grouped = defaultdict(lambda: defaultdict(list))
-
-    for row in rows:
-        cleaned_row = {
-            "id": row.get("id", ""),
-            "title": row.get("ARTICLE_TITLE", "").strip(),
-            "link": (row.get("TELEGRAM_URL") or "").strip(),
-            "writer": (row.get("WRITER") or "").strip()
-        }
-        date = row.get("SAVE_TIME", "REG_DT").strip()
-        date = datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%f').strftime('%Y-%m-%d')
-        firm = row.get("FIRM_NM", "").strip()
-        grouped[date][firm].append(cleaned_row)
-
-    cache_recent_reports["data"] = grouped
-    cache_recent_reports["last_modified"] = last_modified_time
-    save_json_to_file('recent_reports.json', grouped)  # JSON 파일로 저장
-    db.close_connection()
-
-def update_cache_daily_group_reports():
-    """그룹화된 레포트 캐시 갱신 및 JSON 파일 저장"""
-    db = SQLiteManagerSQL()
-    last_modified_time = db.fetch_last_modified_time()
-
-    if cache_grouped_reports["last_modified"] == last_modified_time:
-        print("[그룹화된 레포트] 데이터 변경 없음. 캐시를 사용합니다.")
-        db.close_connection()
-        return
-
-    print("[그룹화된 레포트] 데이터 변경 감지. 캐시를 갱신합니다.")
-    rows = db.fetch_daily_articles_by_date()
-    grouped = defaultdict(lambda: defaultdict(list))
-
-    for row in rows:
-        cleaned_row = {
-            "id": row.get("id", ""),
-            "title": row.get("ARTICLE_TITLE", "").strip(),
-            "link": (row.get("TELEGRAM_URL") or "").strip(),
-            "writer": (row.get("WRITER") or "").strip()
-        }
-        date = row.get("REG_DT", "").strip()
-        firm = row.get("FIRM_NM", "").strip()
-        grouped[date][firm].append(cleaned_row)
-
-    cache_grouped_reports["data"] = grouped
-    cache_grouped_reports["last_modified"] = last_modified_time
-    # save_json_to_file('grouped_reports.json', grouped)  # JSON 파일로 저장
-    save_json_to_file('daily_group_reports.json', grouped)  # JSON 파일로 저장
-    db.close_connection()
-
-def update_cache_recent_global_reports():
-    """최근 글로벌 레포트 캐시 갱신 및 JSON 파일 저장"""
+# 스냅샷 게시 (원자적 쓰기 + .gz/.br + 콘텐츠 해시 파일명 + manifest.json). 리더 워커만 기록
+snapshot_writer = SnapshotWriter(static_folder)
+
+# 모든 워커는 리더가 게시한 manifest.json 만 읽음 (레포트 데이터는 워커 메모리에 두지 않음)
+snapshot_manifest = SnapshotManifest(static_folder, check_interval=float(os.getenv('SNAPSHOT_CHECK_INTERVAL', 1)))
+
+# gunicorn 워커 중 하나만 DB 조회/스냅샷 게시를 담당 (파일 잠금으로 선출, 리더가 죽으면 다른 워커가 이어받음)
+refresh_leader = RefreshLeader(
+    os.getenv('REFRESH_LOCK_PATH', os.path.join(tempfile.gettempdir(), 'docker-flask-refresh.lock')),
+    interval=float(os.getenv('CACHE_WATCH_INTERVAL', 5)),
+)
+# 리더가 마지막으로 게시한 DB 버전 (MAX(SAVE_TIME))
+published_last_modified = None
+
+# 레포트 뷰 정의 (JSON 파일명 → 증분 갱신 상태). 한 번의 조회로 세 뷰를 함께 만든다
+report_views = {
+    "recent_reports": IncrementalGroupedCache(save_time_date, days_before=3),
+    "daily_group_reports": IncrementalGroupedCache(reg_dt_date, days_before=3),
+    "daily_global_reports": IncrementalGroupedCache(save_time_date, days_before=14, row_filter=is_global_report),
+}
+# 증분 조회로 놓치는 변경(링크가 이미 있는 행의 수정, 행 삭제)은 이 주기(초)마다 윈도우 전체 재조정으로 반영
+report_builder = ReportSnapshotBuilder(report_views, reconcile_interval=float(os.getenv('CACHE_RECONCILE_INTERVAL', 600)))
+
+# 검색 한 페이지 최대 건수
+SEARCH_MAX_LIMIT = 100
+
+# 검색 결과 캐시 (게시된 스냅샷 버전이 바뀌면 전체 무효화)
+search_cache = SearchResultCache(
+    max_entries=int(os.getenv('SEARCH_CACHE_SIZE', 512)),
+    ttl=float(os.getenv('SEARCH_CACHE_TTL', 300)),
+)
+
+# /reports/global/<id> 한 페이지 건수와 리더가 게시하는 글로벌 id 인덱스 크기 (이보다 오래된 페이지는 DB 조회)
+GLOBAL_PAGE_SIZE = 10
+GLOBAL_INDEX_SIZE = int(os.getenv('GLOBAL_INDEX_SIZE', 2000))
+
+# 같은 검색이 동시에 들어오면 DB 조회 한 번을 공유 (워커별)
+search_flight = SingleFlight()
+# 검색 DB 조회 동시 실행 수 제한 (기본: Oracle 세션 풀 최대 크기). 대기열이 차면 기다리지 않고 503 + Retry-After
+search_limiter = ConcurrencyLimiter(
+    max_concurrent=int(os.getenv('SEARCH_MAX_CONCURRENCY', oracle_pool.max_sessions)),
+    max_queue=int(os.getenv('SEARCH_MAX_QUEUE', 8)),
+    queue_timeout=float(os.getenv('SEARCH_QUEUE_TIMEOUT', 2)),
+)
+SEARCH_RETRY_AFTER = os.getenv('SEARCH_RETRY_AFTER', '2')
+
+# Oracle → 로컬 SQLite 복제본 (REPLICA_SQLITE_PATH). READ_FROM_REPLICA=1 이면 검색/글로벌 조회를 복제본에서 처리
+REPLICA_SQLITE_PATH = os.getenv('REPLICA_SQLITE_PATH')
+replica_path = os.path.expanduser(REPLICA_SQLITE_PATH) if REPLICA_SQLITE_PATH else None
+replica_pool = SQLiteConnectionPool(replica_path) if replica_path else None
+replica_state = ReplicaStateReader(replica_pool, check_interval=float(os.getenv('SNAPSHOT_CHECK_INTERVAL', 1))) if replica_pool else None
+READ_FROM_REPLICA = replica_pool is not None and os.getenv('READ_FROM_REPLICA', '0') == '1'
+
+def update_report_caches():
+    """가장 넓은 윈도우를 한 번만 조회해 세 레포트 캐시를 갱신하고 JSON 스냅샷 게시. 갱신 여부 반환"""
+    global published_last_modified
     db = SQLiteManagerSQL()
     last_modified_time = db.fetch_last_modified_time()
 
-    if cache_recent_global_reports["last_modified"] == last_modified_time:
-        print("[최근 글로벌 레포트] 데이터 변경 없음. 캐시를 사용합니다.")
+    if published_last_modified == last_modified_time and not report_builder.needs_refresh():
+        print("[레포트 캐시] 데이터 변경 없음. 캐시를 사용합니다.")
         db.close_connection()
-        return
-
-    print("[최근 글로벌 레포트] 데이터 변경 감지. 캐시를 갱신합니다.")
-    rows = db.fetch_global_articles_by_todate()
-    grouped = defaultdict(lambda: defaultdict(list))
-
-    for row in rows:
-        cleaned_row = {
-            "id": row.get("id", ""),
-            "title": row.get("ARTICLE_TITLE", "").strip(),
-            "link": (row.get("TELEGRAM_URL") or "").strip(),
-            "writer": (row.get("WRITER") or "").strip()
-        }
-        date = row.get("SAVE_TIME", "REG_DT").strip()
-        date = datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%f').strftime('%Y-%m-%d')
-        firm = row.get("FIRM_NM", "").strip()
-        grouped[date][firm].append(cleaned_row)
-
-    cache_recent_global_reports["data"] = grouped
-    cache_recent_global_reports["last_modified"] = last_modified_time
-
-    save_json_to_file('daily_global_reports.json', grouped)  # JSON 파일로 저장
+        return False
+
+    print("[레포트 캐시] 데이터 변경 감지. 캐시를 증분 갱신합니다.")
+    changed = report_builder.refresh(db)
+    state = report_builder.state()
+    # 글로벌 무한 스크롤용 최근 글로벌 레포트 id 인덱스는 글로벌 뷰나 최대 id 가 바뀐 경우에만 다시 만듦
+    # (링크 대기 행이 있으면 매 주기 갱신을 확인하므로, 바뀐 것이 없을 때 2000건 재조회/압축/manifest 재기록을 피함)
+    index_files = {}
+    if ("daily_global_reports" in changed or state["max_id"] != snapshot_writer.meta().get("max_id")
+            or GLOBAL_INDEX_NAME not in snapshot_writer.manifest):
+        # 부분 인덱스를 id 순으로 읽다가 LIMIT 에서 멈추는 쿼리
+        index_files[GLOBAL_INDEX_NAME] = build_index_snapshot(
+            db.fetch_global_articles_by_id(0, GLOBAL_INDEX_SIZE), GLOBAL_INDEX_SIZE,
+        )
     db.close_connection()
 
-# 작업 스케줄링
-scheduler.add_job(update_cache_recent_reports, 'cron', minute='10,40')
-scheduler.add_job(update_cache_daily_group_reports, 'cron', minute='10,40')
-scheduler.add_job(update_cache_recent_global_reports, 'cron', minute='10,40')
+    if not changed and not index_files:
+        print("[레포트 캐시] 게시 내용 변경 없음. 기존 스냅샷을 유지합니다.")
+        published_last_modified = last_modified_time
+        return False
+
+    for name in changed:
+        CACHE_UPDATES.labels(name).inc()
+    # 바뀐 뷰만 다시 쓰고 DB 버전과 함께 manifest 를 한 번에 교체 → 다른 워커가 다음 요청부터 새 버전을 사용
+    # 일자별 파티션은 바뀐 일자만 다시 기록 (지난 일자 파일은 그대로 영구 캐시)
+    # 메타데이터에는 재시작 시 스냅샷으로 캐시를 복원(웜 스타트)하는 데 필요한 구조 버전과 증분 상태도 함께 기록
+    files = snapshot_writer.publish(
+        {name: report_views[name].data for name in changed},
+        {
+            "last_modified": last_modified_time.isoformat() if last_modified_time else None,
+            # 응답 Last-Modified 용 게시 시각 (링크 발송처럼 SAVE_TIME 이 그대로인 변경도 반영)
+            "published_at": datetime.now().isoformat(timespec='seconds'),
+            "format": SNAPSHOT_FORMAT_VERSION,
+            **state,
+        },
+        {name: report_views[name].changed_dates for name in changed},
+        index_files,
+    )
+    for filename in files.values():
+        print(f"[JSON 저장 완료] {os.path.join(static_folder, filename)}")
+    published_last_modified = last_modified_time
+
+    stats = sqlite_pool.stats()
+    print(f"[SQLite 커넥션] 생성 {stats['opened']}회 / 재사용 {stats['reused']}회")
+    stats = oracle_pool.stats()
+    print(f"[Oracle 풀] 세션 {stats['opened']}개 / 사용 중 {stats['busy']}개 / 최대 {stats['max']}개")
+    stats = search_cache.stats()
+    print(f"[검색 캐시] 적중 {stats['hits']} / 미적중 {stats['misses']} / 제거 {stats['evictions']} / 무효화 {stats['invalidations']}")
+    return True
+
+def refresh_all_caches():
+    """레포트 캐시 갱신 + 소요 시간/결과 메트릭 기록 (ChangeWatcher 스레드에서만 호출)"""
+    started = time.perf_counter()
+    try:
+        changed = update_report_caches()
+    except Exception:
+        CACHE_REFRESHES.labels("error").inc()
+        raise
+    finally:
+        CACHE_REFRESH_DURATION.observe(time.perf_counter() - started)
+    CACHE_REFRESHES.labels("changed" if changed else "unchanged").inc()
+    CACHE_LAST_REFRESH.set(time.time())
+
+def warm_start():
+    """
+    마지막으로 게시된 스냅샷으로 레포트 캐시를 복원 (DB 전체 조회 없이 바로 요청 처리). 복원했으면 True
+    스냅샷 구조 버전, 뷰 윈도우(오늘 날짜/설정), 파일 해시가 모두 맞을 때만 사용합니다. WARM_START=0 이면 항상 새로 만듦
+    """
+    global published_last_modified
+    if os.getenv('WARM_START', '1') == '0':
+        return False
+    meta = snapshot_writer.meta()
+    if meta.get("format") != SNAPSHOT_FORMAT_VERSION or not meta.get("last_modified"):
+        return False
+    snapshots = {name: snapshot_writer.load(name) for name in report_views}
+    if not report_builder.restore({name: data for name, data in snapshots.items() if data is not None}, meta):
+        return False
+    published_last_modified = datetime.fromisoformat(meta["last_modified"])
+    return True
+
+def reconcile_in_background():
+    """웜 스타트 후 복원한 캐시를 DB 와 맞춤 (윈도우 전체 재조정, 요청 처리와 별도 스레드)"""
+    def run():
+        started = time.perf_counter()
+        if watcher.refresh():
+            print(f"[웜 스타트] DB 재조정 완료 ({time.perf_counter() - started:.2f}초)")
+    threading.Thread(target=run, name="warm-start-reconcile", daemon=True).start()
+
+def sync_replica():
+    """Oracle 의 새 행/최근 변경 행을 로컬 복제본에 반영 (리더 워커의 스케줄러에서만 실행)"""
+    replica = SQLiteReplica(replica_path, batch_size=int(os.getenv('REPLICA_BATCH_SIZE', 1000)))
+    source = OracleManagerSQL()
+    try:
+        result = replica.sync(source)
+    finally:
+        source.close_connection()
+        replica.close_connection()
+    REPLICA_ROWS.labels("inserted").inc(result["inserted"])
+    REPLICA_ROWS.labels("updated").inc(result["updated"])
+    REPLICA_SOURCE_LAG.set(result["lag"])
+    REPLICA_LAST_SYNC.set(time.time())
+    if result["inserted"] or result["updated"]:
+        print(f"[복제본] 새 행 {result['inserted']}건 / 변경 {result['updated']}건 / 원본 대비 지연 {result['lag']:.0f}초")
+
+# DB 변경 감지 → 백그라운드 단일 갱신
+watcher = ChangeWatcher(db_path, refresh_all_caches, interval=float(os.getenv('CACHE_WATCH_INTERVAL', 5)))
+
+# 작업 스케줄링 (변경 감지를 놓치는 경우를 대비한 안전망, 실제 갱신은 watcher 스레드에서 수행)
+scheduler.add_job(watcher.trigger, 'cron', minute='10,40', id='watch_trigger')
+if replica_path and DB_DSN:
+    scheduler.add_job(
+        sync_replica, 'interval', seconds=float(os.getenv('REPLICA_SYNC_INTERVAL', 60)), id='replica_sync',
+        max_instances=1, coalesce=True, next_run_time=datetime.now(),
+    )
+scheduler.add_listener(observe_scheduler_event, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED)
 
 
 # 플래그로 스케줄러 시작 여부 확인
 scheduler_started = False
 
+def ensure_indexes_in_background():
+    """
+    SQLITE_ENSURE_INDEXES=1 일 때만 핫 쿼리용 인덱스가 없으면 백그라운드 스레드에서 생성 (리더 워커만).
+    수집기가 쓰는 운영 DB 에서 CREATE INDEX 는 오래 걸리고 쓰기 잠금을 잡으므로 기본은 끄고
+    `python -m model.SQLiteSchema ensure` 로 미리 만듦. 워커 import/요청 경로에서는 실행하지 않음
+    """
+    if os.getenv('SQLITE_ENSURE_INDEXES', '0') != '1':
+        return
+    def run():
+        started = time.perf_counter()
+        try:
+            created = ensure_indexes(db_path)
+        except Exception as e:
+            print(f"[인덱스] 생성 실패 (기존 쿼리 계획으로 계속): {e}")
+            return
+        if created:
+            print(f"[인덱스] 생성: {', '.join(created)} ({time.perf_counter() - started:.2f}초)")
+    threading.Thread(target=run, name="sqlite-ensure-indexes", daemon=True).start()
+
+def start_refresher():
+    """리더로 선출된 워커에서만 APScheduler 및 변경 감시 시작"""
+    REFRESH_LEADER.set(1)
+    ensure_indexes_in_background()
+    scheduler.start()
+    watcher.start()
+    print("APScheduler가 시작되었습니다.")
+
 def start_scheduler_on_first_request():
-    """첫 요청 시 APScheduler 시작"""
+    """
+    import 시 리더가 되지 못한 워커는 첫 요청 시 리더 선출 재시도를 시작 (요청 스레드에서는 캐시를 갱신하지 않음)
+    (import 시 리더가 된 워커는 이미 스케줄러/변경 감시를 시작했으므로 아무것도 하지 않음)
+    """
     global scheduler_started
     if not scheduler_started:
-        scheduler.start()
         scheduler_started = True
-        print("APScheduler가 시작되었습니다.")
+        refresh_leader.start(start_refresher)
 
-    update_cache_recent_reports()
-    update_cache_daily_group_reports()
-    update_cache_recent_global_reports()
-    
 app.before_request(start_scheduler_on_first_request)
 
-update_cache_recent_reports()
-update_cache_daily_group_reports()
-update_cache_recent_global_reports()
+def published_version():
+    """
+    리더가 게시한 스냅샷 버전(manifest 항목 해시)과 게시 시각.
+    버전이 바뀌었으면 이 워커의 검색 캐시도 비움 (복제본 사용 시 복제본 변경도 반영)
+    """
+    version = snapshot_manifest.version()
+    meta = snapshot_manifest.meta()
+    published_at = meta.get("published_at") or meta.get("last_modified")
+    published_at = datetime.fromisoformat(published_at) if published_at else None
+    search_cache.invalidate((version, replica_state.version()) if READ_FROM_REPLICA else version)
+    return version, published_at
+
+def read_from_replica():
+    """검색/글로벌 조회를 복제본에서 처리할지 (설정이 켜져 있고 한 번 이상 동기화된 경우만)"""
+    return READ_FROM_REPLICA and replica_state.is_ready()
+
+def add_replica_headers(response):
+    """복제본에서 응답한 경우 마지막 동기화 이후 경과 시간(초)을 함께 전달"""
+    lag = replica_state.lag()
+    if lag is not None:
+        response.headers["X-Replica-Lag"] = f"{lag:.0f}"
+    return response
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """라우트별 응답 시간 기록 (등록되지 않은 경로는 하나로 묶어 라벨 수를 제한)"""
+    started = g.get("request_started")
+    if started is not None:
+        REQUEST_DURATION.labels(request.endpoint or "unmatched", request.method, response.status_code).observe(
+            time.perf_counter() - started
+        )
+    return response
+
+# 워커 시작 시 Oracle 세션 풀을 미리 열고 세션 하나로 DB 왕복까지 확인해 첫 검색 요청이 지갑/TLS 연결 비용을 내지 않도록 함
+# (실패해도 기동은 계속하고 첫 검색 요청에서 다시 시도)
+if DB_DSN:
+    try:
+        oracle_pool.ping()
+    except Exception as e:
+        print(f"[Oracle] 세션 풀 생성/연결 확인 실패, 첫 요청에서 다시 시도합니다: {e}")
+
+# 리더가 될 수 있으면 바로 첫 스냅샷을 준비 (다른 워커는 게시된 manifest 를 읽기만 함)
+# 이전에 게시한 스냅샷이 유효하면 그대로 복원해 바로 요청을 받고 DB 재조정은 백그라운드에서,
+# 없으면(첫 배포, 구조 변경, 날짜 변경 등) 기존처럼 전체 조회 후 게시
+startup_mode = "follower"
+if refresh_leader.try_acquire():
+    if warm_start():
+        startup_mode = "warm"
+        reconcile_in_background()
+    else:
+        startup_mode = "cold"
+        refresh_all_caches()
+    # 첫 요청을 기다리지 않고 바로 스케줄러/변경 감시 시작 (요청이 없어도 DB 변경이 게시되도록)
+    scheduler_started = True
+    start_refresher()
+STARTUP_DURATION.labels(startup_mode).set(time.perf_counter() - startup_started)
+print(f"[시작] pid {os.getpid()} 요청 처리 준비 완료 ({startup_mode}, {time.perf_counter() - startup_started:.2f}초)")
+
+# SSE 구독 하나가 워커 스레드 하나를 연결 시간 내내 점유하므로 동시 구독 수는 워커 스레드 수(gunicorn.conf.py 와 같은 기본값)
+# 에서 정함 (기본: 스레드의 1/4). 스레드가 1개(sync 워커)면 구독 하나가 워커 전체를 막으므로 피드를 끔
+GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', 1))
+SSE_MAX_STREAMS = int(os.getenv('SSE_MAX_STREAMS', max(GUNICORN_THREADS // 4, 1))) if GUNICORN_THREADS > 1 else 0
+# 동시 구독 수 초과 시 브라우저가 다시 접속하기까지의 대기 시간 (ms)
+SSE_BUSY_RETRY_MS = int(os.getenv('SSE_BUSY_RETRY_MS', 30000))
+
+# 새 레포트 SSE 피드 (워커별 1개, 게시된 스냅샷 버전이 바뀔 때만 DB 조회, 첫 구독 시 시작)
+# 버전은 manifest 항목 해시 → SAVE_TIME 변경 없이 링크만 채워진 대기 행도 게시되는 즉시 전달
+report_feed = ReportFeed(
+    snapshot_manifest.version,
+    SQLiteManagerSQL,
+    interval=float(os.getenv('SNAPSHOT_CHECK_INTERVAL', 1)),
+    max_streams=SSE_MAX_STREAMS,
+    stream_timeout=float(os.getenv('SSE_STREAM_TIMEOUT', 300)),
+    pending_source=lambda: map(int, snapshot_manifest.meta().get("pending", {})),
+)
+
+# 정적 자원 URL (시작 시 한 번 계산한 콘텐츠 해시를 붙여 영구 캐시 가능)
+styles_url = static_asset_url(app.static_folder, 'css/styles.css')
+scripts_url = static_asset_url(app.static_folder, 'js/scripts.js')
+
+# 렌더링된 HTML 캐시 (스냅샷 버전별)
+page_cache = RenderedPageCache()
+
+# 라우트별 캐시 정책: 스냅샷 버전 기반 ETag 로 재검증(304), 정책이 없는 응답은 저장 금지
+CACHE_POLICIES = {
+    'home': REVALIDATE,
+    'daily_group': REVALIDATE,
+    'search_reports': REVALIDATE,
+    'fetch_reports_global': REVALIDATE,
+    'serve_static': REVALIDATE,
+    'static': REVALIDATE,
+}
 
 @app.after_request
 def add_cache_control_headers(response):
     """
-    모든 응답에 캐시 제어 헤더를 추가합니다.
+    라우트별 캐시 제어 헤더를 추가합니다. 정책이 없는 응답은 저장하지 않도록 합니다.
     """
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-    response.headers["Pragma"] = "no-cache"
-    response.headers["Expires"] = "0"
+    policy = CACHE_POLICIES.get(request.endpoint, NO_STORE)
+    if request.endpoint in ('static', 'serve_static') and (
+        is_hashed_snapshot((request.view_args or {}).get('filename', '')) or request.args.get('v')
+    ):
+        policy = IMMUTABLE
+    response.headers["Cache-Control"] = policy
+    if policy == NO_STORE:
+        response.headers["Pragma"] = "no-cache"
+        response.headers["Expires"] = "0"
     return response
 
 @app.route('/static/<path:filename>')
@@ -183,7 +401,7 @@ def serve_static(filename):
     if os.path.exists(file_path):
         # 타임스탬프 생성
         timestamp = int(os.path.getmtime(file_path))
-        # 응답에 타임스탬프를 추가
+        # 응답에 타임스탬프를 추가 (send_from_directory 가 ETag/Last-Modified 및 304 처리)
         response = send_from_directory('static', filename)
         response.headers['X-Timestamp'] = timestamp  # 디버깅용 헤더
         return response
@@ -192,86 +410,191 @@ def serve_static(filename):
 
 @app.route('/')
 def home():
-    if cache_recent_reports["data"] is None:
-        update_cache_recent_reports()
-    grouped_reports = cache_recent_reports["data"]
-    styles_url = f"/static/css/styles.css?t={int(time.time())}"
-    scripts_url = f"/static/js/scripts.js?t={int(time.time())}"
-    return render_template('index.html', grouped_reports=grouped_reports, subtitle="최근 레포트", styles_url=styles_url, scripts_url=scripts_url)
+    version, last_modified = published_version()
+    snapshot_url = snapshot_manifest.url("recent_reports")
+    index_url = snapshot_manifest.index_url("recent_reports")
+    if snapshot_url is None:
+        watcher.trigger()
+    etag = version_etag("home", version, snapshot_url, index_url, styles_url, scripts_url)
+    cached = not_modified(etag, last_modified)
+    if cached is not None:
+        CACHE_REQUESTS.labels("home", "not_modified").inc()
+        return cached
+
+    # 스냅샷 버전이 바뀐 경우에만 다시 렌더링
+    return page_cache.response("home", etag, last_modified, lambda: render_template(
+        'index.html', subtitle="최근 레포트",
+        styles_url=styles_url, scripts_url=scripts_url, snapshot_url=snapshot_url, index_url=index_url,
+    ))
 
 @app.route('/report/daily_group')
 def daily_group():
-    if cache_grouped_reports["data"] is None:
-        update_cache_daily_group_reports()
-    grouped_reports = cache_grouped_reports["data"]
-    # 정적 파일에 타임스탬프 추가
-    styles_url = f"/static/css/styles.css?t={int(time.time())}"
-    scripts_url = f"/static/js/scripts.js?t={int(time.time())}"
-    return render_template('index.html', grouped_reports=grouped_reports, subtitle="일자별 레포트", styles_url=styles_url, scripts_url=scripts_url)
+    version, last_modified = published_version()
+    snapshot_url = snapshot_manifest.url("daily_group_reports")
+    index_url = snapshot_manifest.index_url("daily_group_reports")
+    if snapshot_url is None:
+        watcher.trigger()
+    etag = version_etag("daily_group", version, snapshot_url, index_url, styles_url, scripts_url)
+    cached = not_modified(etag, last_modified)
+    if cached is not None:
+        CACHE_REQUESTS.labels("daily_group", "not_modified").inc()
+        return cached
+
+    # 스냅샷 버전이 바뀐 경우에만 다시 렌더링
+    return page_cache.response("daily_group", etag, last_modified, lambda: render_template(
+        'index.html', subtitle="일자별 레포트",
+        styles_url=styles_url, scripts_url=scripts_url, snapshot_url=snapshot_url, index_url=index_url,
+    ))
 
 @app.route('/reports/search', methods=['GET'])
 def search_reports():
     """키워드로 레포트 검색"""
-    keyword = request.args.get('keyword', '').strip()
-    offset = int(request.args.get('offset', 0))
-    limit = int(request.args.get('limit', 30))
-    last_id = int(request.args.get('last_id', 0))
-
-    db = OracleManagerSQL()
-    rows = db.search_reports_by_keyword(keyword, last_id, offset, limit)  # 키워드로 데이터베이스 검색
-    rows = rows[offset:offset + limit]
-
-    paginated_results = defaultdict(lambda: defaultdict(list))
-
-    for row in rows:
-        cleaned_row = {
-            "id": row.get("id", ""),
-            "title": row.get("ARTICLE_TITLE", "").strip(),
-            "link": (row.get("TELEGRAM_URL") or "").strip(),
-            "writer": (row.get("WRITER") or "").strip()
-        }
-        date = row.get("SAVE_TIME", "REG_DT").strip()
-        date = datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%f').strftime('%Y-%m-%d')
-        firm = row.get("FIRM_NM", "").strip()
-        paginated_results[date][firm].append(cleaned_row)
-
-    db.close_connection()
-
-    # 페이징 처리
-    return jsonify(paginated_results)
+    keyword = normalize_keyword(request.args.get('keyword', ''))
+    try:
+        limit = min(max(int(request.args.get('limit', 30)), 1), SEARCH_MAX_LIMIT)
+        # cursor(다음 페이지 토큰) 우선, 기존 last_id 파라미터도 지원
+        cursor = request.args.get('cursor')
+        last_id = decode_cursor(cursor) if cursor else int(request.args.get('last_id', 0))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    version, _ = published_version()
+    use_replica = read_from_replica()
+    etag = version_etag("search", version, replica_state.version() if use_replica else None, keyword, last_id, limit)
+    not_modified_response = not_modified(etag)
+    if not_modified_response is not None:
+        CACHE_REQUESTS.labels("search", "not_modified").inc()
+        return not_modified_response
+
+    cache_key = (keyword, last_id, limit, use_replica)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        CACHE_REQUESTS.labels("search", "hit").inc()
+        response = set_validators(jsonify(cached), etag)
+        return add_replica_headers(response) if use_replica else response
+    CACHE_REQUESTS.labels("search", "miss").inc()
+    generation = search_cache.generation
+
+    # 같은 조건의 검색이 이미 진행 중이면 그 결과를 함께 받음 (캐시 무효화 이후 요청은 새로 조회)
+    try:
+        result, shared = search_flight.do(
+            (cache_key, generation),
+            lambda: run_search(keyword, last_id, limit, use_replica, cache_key, generation),
+        )
+    except Overloaded:
+        SEARCH_ADMISSIONS.labels("shed").inc()
+        response = jsonify({"error": "too many searches"})
+        response.status_code = 503
+        response.headers["Retry-After"] = SEARCH_RETRY_AFTER
+        return response
+    SEARCH_ADMISSIONS.labels("coalesced" if shared else "executed").inc()
+    response = set_validators(jsonify(result), etag)
+    return add_replica_headers(response) if use_replica else response
+
+def run_search(keyword, last_id, limit, use_replica, cache_key, generation):
+    """동시 실행 자리를 받아 검색 DB 조회 후 캐시에 저장 (자리가 없으면 Overloaded)"""
+    SEARCH_QUEUE_WAIT.observe(search_limiter.acquire())
+    try:
+        # 다음 페이지 존재 여부 확인을 위해 limit + 1 건 조회
+        db = SQLiteManagerSQL(replica_pool) if use_replica else OracleManagerSQL()
+        try:
+            rows = db.search_reports_by_keyword(keyword, last_id, limit + 1)  # 키워드로 데이터베이스 검색
+        finally:
+            db.close_connection()
+    finally:
+        search_limiter.release()
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    result = {
+        "data": group_reports(rows),
+        "next_cursor": encode_cursor(rows[-1].id) if has_next else None,
+    }
+    search_cache.set(cache_key, result, generation)
+    return result
 
 @app.route('/reports/global/<int:id>', methods=['GET'])
 def fetch_reports_global(id):
     """글로벌 레포트 조회"""
     if id is None:
         id = 0
-    
-    db = SQLiteManagerSQL()
-    rows = db.fetch_global_articles_by_id(id)  # 글로벌 레포트 조회
-    
-    paginated_results = defaultdict(lambda: defaultdict(list))
-    for row in rows:
-        cleaned_row = {
-            "id": row.get("id", ""),
-            "title": row.get("ARTICLE_TITLE", "").strip(),
-            "link": (row.get("TELEGRAM_URL") or "").strip(),
-            "writer": (row.get("WRITER") or "").strip()
-        }
-        date = row.get("SAVE_TIME", "REG_DT").strip()
-        date = datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%f').strftime('%Y-%m-%d')
-        firm = row.get("FIRM_NM", "").strip()
-        paginated_results[date][firm].append(cleaned_row)
-
-    # 일자별 내림차순 정렬
-    sorted_paginated_results = {
-        date: paginated_results[date] 
-        for date in sorted(paginated_results.keys(), reverse=True)
-    }
+
+    _, last_modified = published_version()
+    # 글로벌 페이지 내용은 게시된 글로벌 인덱스 해시로 결정 (다른 뷰만 바뀐 갱신에는 304 유지)
+    version = snapshot_manifest.version(GLOBAL_INDEX_NAME)
+    use_replica = read_from_replica()
+    if use_replica:
+        # 복제본 내용은 로컬 DB 버전과 무관하게 바뀌므로 Last-Modified 대신 ETag 로만 재검증
+        etag = version_etag("global", version, replica_state.version(), id)
+        last_modified = None
+    else:
+        etag = version_etag("global", version, id)
+    cached = not_modified(etag, last_modified)
+    if cached is not None:
+        CACHE_REQUESTS.labels("global", "not_modified").inc()
+        return cached
+
+    # 게시된 글로벌 인덱스(게시 버전과 같은 시점의 로컬 DB)로 응답. 복제본 사용 시에는 원본이 달라 항상 DB 조회
+    if not use_replica:
+        payload, reports = global_index.page(id)
+        if payload is not None or reports is not None:
+            CACHE_REQUESTS.labels("global", "hit").inc()
+            if payload is None:
+                return set_validators(jsonify(global_page(reports)), etag, last_modified)
+            response = app.response_class(payload, mimetype=app.json.mimetype)
+            return set_validators(response, etag, last_modified)
+    CACHE_REQUESTS.labels("global", "miss").inc()
+
+    db = SQLiteManagerSQL(replica_pool) if use_replica else SQLiteManagerSQL()
+    rows = db.fetch_global_articles_by_id(id, GLOBAL_PAGE_SIZE)  # 글로벌 레포트 조회
     db.close_connection()
 
     # 페이징 처리
-    return jsonify(sorted_paginated_results)
+    response = set_validators(jsonify(global_page(map(make_report, rows))), etag, last_modified)
+    return add_replica_headers(response) if use_replica else response
+
+def global_page(reports):
+    """글로벌 한 페이지 응답 (SAVE_TIME 일자 → 증권사 → 레포트, 일자별 내림차순)"""
+    paginated_results = group_report_objects(reports)
+    return {date: paginated_results[date] for date in sorted(paginated_results.keys(), reverse=True)}
+
+# 워커별 글로벌 인덱스 (manifest 의 인덱스가 바뀔 때만 다시 읽고 첫 페이지들은 미리 직렬화)
+global_index = GlobalIndexReader(
+    snapshot_manifest,
+    lambda reports: app.json.response(global_page(reports)).get_data(),
+    page_size=GLOBAL_PAGE_SIZE,
+    pages=int(os.getenv('GLOBAL_PRESERIALIZED_PAGES', 3)),
+)
+
+@app.route('/reports/stream')
+def stream_reports():
+    """새로 노출된 레포트를 Server-Sent Events 로 전달 (last_id 또는 Last-Event-ID 이후 행만)"""
+    try:
+        last_id = int(request.headers.get('Last-Event-ID') or request.args.get('last_id', 0))
+    except ValueError:
+        return jsonify({"error": "invalid last_id"}), 400
+
+    # 피드를 끈 경우 204: EventSource 는 재접속하지 않고 닫히며 페이지는 manifest 폴링으로 전환
+    if not SSE_MAX_STREAMS:
+        return Response(status=204)
+
+    # 구독 하나가 워커 스레드 하나를 점유하므로 동시 구독 수 제한. 503 이면 EventSource 가 영구히 닫히므로
+    # 200 + retry 만 보내고 바로 닫아 브라우저가 SSE_BUSY_RETRY_MS 후 다시 접속하게 함
+    if not report_feed.try_open():
+        response = Response(sse_retry(SSE_BUSY_RETRY_MS), mimetype='text/event-stream')
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+
+    response = Response(report_feed.stream(last_id), mimetype='text/event-stream')
+    response.headers["X-Accel-Buffering"] = "no"
+    response.call_on_close(report_feed.close)
+    return response
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus 수집용 메트릭 (멀티 워커면 모든 워커 합산)"""
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
 
 if __name__ == "__main__":
     if os.getenv('FLASK_ENV') == 'development':
@@ -0,0 +1,109 @@
+"""
+세 레포트 캐시(recent / daily_group / daily_global)의 상주 메모리 비교 벤치마크.
+
+  before: SELECT * + 행마다 dict(zip(...)) + 정리된 dict 를 그룹 캐시에 보관하던 방식
+  after : 필요한 컬럼만 조회한 ReportRow + __slots__ Report 기반 증분 캐시
+
+사용법: uv run python -m bench.cache_memory --rows 1000000
+"""
+import argparse
+import gc
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from bench.synthetic_data import create_table
+
+
+def build_legacy_caches(db_path):
+    """기존 update_cache_* 세 함수와 같은 방식으로 캐시 생성"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    today = datetime.now()
+    caches = []
+    for days, where, key in (
+        (3, "", "SAVE_TIME"),
+        (3, "", "REG_DT"),
+        (14, "MAIN_CH_SEND_YN = 'Y' AND MKT_TP <> 'KR' AND ", "SAVE_TIME"),
+    ):
+        from_dt = (today - timedelta(days=days)).strftime('%Y%m%d')
+        to_dt = (today + timedelta(days=2)).strftime('%Y%m%d')
+        cursor.execute(f"SELECT * FROM data_main_daily_send WHERE {where}REG_DT BETWEEN ? AND ? ORDER BY id DESC", (from_dt, to_dt))
+        rows = [dict(zip([column[0] for column in cursor.description], row)) for row in cursor.fetchall()]
+        grouped = defaultdict(lambda: defaultdict(list))
+        for row in rows:
+            cleaned_row = {
+                "id": row.get("id", ""),
+                "title": row.get("ARTICLE_TITLE", "").strip(),
+                "link": (row.get("TELEGRAM_URL") or "").strip(),
+                "writer": (row.get("WRITER") or "").strip()
+            }
+            date = row.get(key, "").strip()
+            if key == "SAVE_TIME":
+                date = datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%f').strftime('%Y-%m-%d')
+            grouped[date][row.get("FIRM_NM", "").strip()].append(cleaned_row)
+        caches.append(grouped)
+        del rows
+    conn.close()
+    return caches
+
+
+def build_current_caches(db_path):
+    """현재 app.py 와 같은 방식(ReportSnapshotBuilder)으로 캐시 생성"""
+    from model.SQLiteManager import SQLiteManagerSQL
+    from service.ReportCache import IncrementalGroupedCache, ReportSnapshotBuilder
+    from service.ReportTransform import save_time_date, reg_dt_date, is_global_report
+
+    views = {
+        "recent_reports": IncrementalGroupedCache(save_time_date, days_before=3),
+        "daily_group_reports": IncrementalGroupedCache(reg_dt_date, days_before=3),
+        "daily_global_reports": IncrementalGroupedCache(save_time_date, days_before=14, row_filter=is_global_report),
+    }
+    db = SQLiteManagerSQL()
+    ReportSnapshotBuilder(views).refresh(db)
+    db.close_connection()
+    return views
+
+
+def measure(label, build, db_path):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    caches = build(db_path)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    resident, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<8} 상주 {resident / 1024 / 1024:8.1f} MiB   최대 {peak / 1024 / 1024:8.1f} MiB   생성 {elapsed:6.2f}초")
+    del caches
+    return resident
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="레포트 캐시 메모리 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        create_table(db_path, args.rows, days=args.days)
+        os.environ["SQLITE_PATH"] = db_path
+        # 모듈 import 비용(prometheus_client 등)이 캐시 메모리로 잡히지 않도록 측정 전에 미리 import
+        # (SQLiteManager 는 import 시 SQLITE_PATH 를 읽으므로 경로를 지정한 뒤에)
+        import model.SQLiteManager
+        import service.ReportCache
+        import service.ReportTransform
+        print(f"합성 테이블 {args.rows:,}행 / {args.days}일")
+
+        before = measure("before", build_legacy_caches, db_path)
+        after = measure("after", build_current_caches, db_path)
+        delta = (after - before) / 1024 / 1024
+        if after < before:
+            print(f"상주 메모리 {before / after:.1f}배 감소 ({-delta:.1f} MiB 절약)")
+        else:
+            print(f"상주 메모리 {after / max(before, 1):.1f}배 증가 ({delta:+.1f} MiB)")
@@ -0,0 +1,103 @@
+"""
+레포트 스냅샷 JSON 직렬화 벤치마크 (스냅샷별 직렬화 시간 / 최대 메모리).
+
+  stdlib : json.dumps(...).encode() — 전체 str 을 만든 뒤 UTF-8 bytes 로 한 번 더 복사하던 기존 방식
+  fast   : service.JsonProvider.dumps_bytes (orjson 이 있으면 bytes 로 바로 직렬화)
+  stream : iter_json_chunks — 일자 단위 청크로 직렬화 (SnapshotWriter 가 임시 파일에 바로 기록하는 경로)
+  write  : SnapshotWriter.write — 스트리밍 직렬화 + sha256 + .gz/.br 압축 + 원자적 기록 전체
+
+최대 메모리는 tracemalloc 기준이며 캐시(Report 객체) 자체는 측정 전에 만들어 두므로 제외됩니다.
+
+사용법: uv run python -m bench.json_serialize --rows 200000
+"""
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from bench.synthetic_data import ensure_table
+
+
+def build_snapshots(db_path):
+    """app.py 와 같은 세 뷰의 스냅샷 데이터 생성"""
+    from model.SQLiteManager import SQLiteManagerSQL
+    from service.ReportCache import IncrementalGroupedCache, ReportSnapshotBuilder
+    from service.ReportTransform import save_time_date, reg_dt_date, is_global_report
+
+    views = {
+        "recent_reports": IncrementalGroupedCache(save_time_date, days_before=3),
+        "daily_group_reports": IncrementalGroupedCache(reg_dt_date, days_before=3),
+        "daily_global_reports": IncrementalGroupedCache(save_time_date, days_before=14, row_filter=is_global_report),
+    }
+    db = SQLiteManagerSQL()
+    ReportSnapshotBuilder(views).refresh(db)
+    db.close_connection()
+    return {name: view.data for name, view in views.items()}
+
+
+def serialize_stdlib(name, data):
+    from service.ReportTransform import report_json_default
+    return len(json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=report_json_default).encode('utf-8'))
+
+
+def serialize_fast(name, data):
+    from service.JsonProvider import dumps_bytes
+    return len(dumps_bytes(data))
+
+
+def serialize_stream(name, data):
+    from service.JsonProvider import iter_json_chunks
+    return sum(len(chunk) for chunk in iter_json_chunks(data))
+
+
+def measure(func, name, data, iterations):
+    """(중앙값 시간(초), 최대 메모리(bytes), 출력 크기)"""
+    size = func(name, data)
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func(name, data)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    gc.collect()
+    tracemalloc.start()
+    func(name, data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return timings[len(timings) // 2], peak, size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스냅샷 JSON 직렬화 벤치마크")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--db", help="합성 DB 경로 (없거나 행 수가 다르면 생성, 기본: 임시 DB)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.abspath(args.db or os.path.join(tmp, "bench.db"))
+        ensure_table(db_path, args.rows, days=args.days)
+        os.environ["SQLITE_PATH"] = db_path
+
+        from service.JsonProvider import orjson
+        from service.SnapshotWriter import SnapshotWriter
+        folder = os.path.join(tmp, "reports")
+        os.makedirs(folder)
+        writer = SnapshotWriter(folder)
+
+        def write_snapshot(name, data):
+            writer.write(name, data)
+            return writer.manifest[name]["bytes"]
+
+        snapshots = build_snapshots(db_path)
+        print(f"합성 테이블 {args.rows:,}행 / {args.days}일 / orjson {'사용' if orjson is not None else '없음 (표준 json)'}")
+        for name, data in snapshots.items():
+            print(f"\n{name}")
+            for label, func in (("stdlib", serialize_stdlib), ("fast", serialize_fast),
+                                ("stream", serialize_stream), ("write", write_snapshot)):
+                elapsed, peak, size = measure(func, name, data, args.iterations)
+                print(f"  {label:<7} {elapsed * 1000:8.1f} ms   최대 {peak / 1024 / 1024:7.1f} MiB   출력 {size / 1024 / 1024:6.1f} MiB")
@@ -0,0 +1,137 @@
+"""
+/reports/search, /reports/global/<id> 동시 요청 부하 테스트.
+
+같은 합성 DB 로 gunicorn 을 두 가지 방식으로 띄워 동시 접속 수별 처리량과 지연을 비교합니다.
+
+  sync   : 워커당 스레드 1개 (기존 방식, Oracle 조회 동안 워커 전체가 멈춤)
+  gthread: 워커당 스레드 N개 (GUNICORN_THREADS, 조회를 기다리는 동안 다른 요청 처리)
+
+Oracle 검색은 bench.standin_app 이 SQLite + 지연(--delay)으로 대체합니다.
+검색 캐시에 걸리지 않도록 요청마다 다른 last_id 를 사용합니다.
+
+사용법: uv run python -m bench.load_test --rows 200000 --concurrency 1 8 32 128 --threads 64
+"""
+import argparse
+import http.client
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+from bench.suite import percentile
+from bench.synthetic_data import ensure_table
+
+PORT = 5099
+
+
+def wait_ready(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/reports/global/0")
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.3)
+    raise RuntimeError("gunicorn 이 시작되지 않았습니다.")
+
+
+def start_server(db_path, workdir, workers, threads, delay, port):
+    env = dict(os.environ, SQLITE_PATH=db_path, BENCH_ORACLE_DELAY=str(delay),
+               REFRESH_LOCK_PATH=os.path.join(workdir, "refresh.lock"),
+               GUNICORN_THREADS=str(threads), PYTHONPATH=os.getcwd())
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+         "--config", os.path.join(os.getcwd(), "gunicorn.conf.py"), "--chdir", workdir, "bench.standin_app:app"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(port)
+    except Exception:
+        process.kill()
+        raise
+    return process
+
+
+def run_load(port, paths, concurrency, duration):
+    """concurrency 개의 keep-alive 클라이언트가 duration 초 동안 요청. (처리량, 지연 목록, 오류 수)"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        local = []
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                conn.request("GET", rng.choice(paths)())
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise RuntimeError(response.status)
+                local.append(time.perf_counter() - started)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    started = time.monotonic()
+    clients = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.monotonic() - started
+    latencies.sort()
+    return len(latencies) / elapsed, latencies, errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동기 / 스레드 워커 동시 요청 부하 테스트")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--db")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=64, help="gthread 모드의 워커당 스레드 수")
+    parser.add_argument("--delay", type=float, default=0.2, help="흉내낼 Oracle 검색 지연 (초)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    db_path = os.path.abspath(args.db or os.path.join(tempfile.gettempdir(), f"bench-{args.rows}.db"))
+    ensure_table(db_path, args.rows, fts=True)
+    keyword = urllib.parse.quote("삼성전자")
+    paths = [
+        lambda: f"/reports/search?keyword={keyword}&last_id={random.randint(1, args.rows)}",
+        lambda: f"/reports/global/{random.randint(1, args.rows)}",
+    ]
+
+    print(f"{'mode':<10}{'clients':>8}{'req/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'errors':>8}")
+    for mode, threads in (("sync", 1), ("gthread", args.threads)):
+        with tempfile.TemporaryDirectory() as workdir:
+            process = start_server(db_path, workdir, args.workers, threads, args.delay, PORT)
+            try:
+                for concurrency in args.concurrency:
+                    throughput, latencies, errors = run_load(PORT, paths, concurrency, args.duration)
+                    print(f"{mode:<10}{concurrency:>8}{throughput:>10.1f}{percentile(latencies, 0.5) * 1000:>10.1f}"
+                          f"{percentile(latencies, 0.95) * 1000:>10.1f}{percentile(latencies, 0.99) * 1000:>10.1f}{errors:>8}")
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
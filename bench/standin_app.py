@@ -0,0 +1,24 @@
+"""
+부하 테스트용 app: Oracle 검색을 SQLite 로 대체하고 Oracle Text 응답 시간을 BENCH_ORACLE_DELAY 초로 흉내냅니다.
+
+gunicorn bench.standin_app:app  (SQLITE_PATH 는 합성 DB 로 지정)
+"""
+import os
+import time
+
+import app as app_module
+from model.SQLiteManager import SQLiteManagerSQL
+
+ORACLE_DELAY = float(os.getenv("BENCH_ORACLE_DELAY", 0.2))
+
+
+class SlowSearchManager(SQLiteManagerSQL):
+    """OracleManagerSQL 대신 사용: 원격 DB 대기 시간(블로킹 I/O)을 sleep 으로 재현"""
+
+    def search_reports_by_keyword(self, keyword, last_id=0, limit=30):
+        time.sleep(ORACLE_DELAY)
+        return super().search_reports_by_keyword(keyword, last_id, limit)
+
+
+app_module.OracleManagerSQL = SlowSearchManager
+app = app_module.app
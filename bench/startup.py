@@ -0,0 +1,67 @@
+"""
+워커 기동 시간 벤치마크 (cold / warm).
+
+  cold : 게시된 스냅샷이 없거나 WARM_START=0 → import 중 전체 조회 + 스냅샷 게시
+  warm : 이전에 게시한 스냅샷으로 캐시를 복원하고 바로 요청 처리, DB 재조정은 백그라운드
+
+새 프로세스에서 `import app` 이 끝날 때까지(gunicorn 워커가 요청을 받을 수 있을 때까지)의 시간과
+warm 의 백그라운드 재조정 완료 시간을 측정합니다.
+
+사용법: uv run python -m bench.startup --rows 1000000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench.synthetic_data import ensure_table
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 자식 프로세스: import 시간과 (warm 이면) 재조정 완료까지의 시간 출력
+CHILD = """
+import threading, time
+started = time.perf_counter()
+import app
+ready = time.perf_counter() - started
+for thread in threading.enumerate():
+    if thread.name == "warm-start-reconcile":
+        thread.join()
+print(f"RESULT {app.startup_mode} {ready:.4f} {time.perf_counter() - started:.4f}")
+"""
+
+
+def boot(workdir, db_path, **env):
+    """새 프로세스에서 app 을 import → (모드, 요청 처리 가능까지 초, 재조정 완료까지 초)"""
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=workdir, capture_output=True, text=True, check=True,
+        env=dict(os.environ, SQLITE_PATH=db_path, REFRESH_LOCK_PATH=os.path.join(workdir, "refresh.lock"),
+                 PYTHONPATH=REPO_ROOT, **env),
+    )
+    line = next(line for line in result.stdout.splitlines() if line.startswith("RESULT "))
+    _, mode, ready, settled = line.split()
+    return mode, float(ready), float(settled)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="워커 기동 시간 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--db", help="합성 DB 경로 (없거나 행 수가 다르면 생성, 기본: 임시 DB)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.abspath(args.db or os.path.join(tmp, "bench.db"))
+        ensure_table(db_path, args.rows, days=args.days)
+        print(f"합성 테이블 {args.rows:,}행 / {args.days}일")
+
+        for label, env in (("cold", {"WARM_START": "0"}), ("warm", {})):
+            readies, settles = [], []
+            for _ in range(args.repeat):
+                # 같은 작업 디렉토리(static/reports)를 써서 warm 은 직전 실행이 게시한 스냅샷을 읽음
+                mode, ready, settled = boot(tmp, db_path, **env)
+                readies.append(ready)
+                settles.append(settled)
+            print(f"{label:<5} ({mode}) 요청 처리 가능 {min(readies):6.2f}초   재조정 완료 {min(settles):6.2f}초")
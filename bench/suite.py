@@ -0,0 +1,266 @@
+"""
+레포트 서비스 벤치마크 스위트.
+
+합성 data_main_daily_send(SQLite)를 만든 뒤 아래 항목을 측정합니다.
+
+  - 레포트 캐시 갱신 (전체 빌드 / 변경 없는 재확인)
+  - SQLiteManagerSQL.fetch_global_articles_by_id
+  - search_reports_by_keyword (FTS5 경로와 2글자 LIKE 경로)
+  - Flask 라우트 (test client: /, /report/daily_group, /reports/search, /reports/global/<id>)
+
+항목별로 처리량(ops/s, rows/s), p50/p95/p99 지연(ms), 최대 메모리(tracemalloc, MiB)를 출력하고
+--save-baseline 으로 결과를 저장, --compare 로 저장된 기준과 비교해 회귀가 있으면 종료 코드 1 을 반환합니다.
+
+Oracle 검색 경로(/reports/search)는 기본적으로 같은 쿼리 인터페이스의 SQLiteManagerSQL 로 대체해 측정합니다.
+(--oracle 을 주면 실제 OracleManagerSQL 사용)
+
+기준은 측정한 머신에 따라 다르므로, 저장소의 bench/baselines/rows-100000.json 은 로컬 비교용 참고값이고
+CI 는 같은 러너에서 PR 의 base 커밋으로 기준을 만든 뒤 head 와 비교합니다. (.github/workflows/ci.yml)
+공유 러너는 실행마다 지연이 크게 흔들리므로 CI 에서는 --rounds 로 min-of-N 을 쓰고 임계값도 넉넉하게 둡니다.
+
+사용법:
+  uv run python -m bench.suite --rows 1000000 --save-baseline
+  uv run python -m bench.suite --rows 1000000 --compare --threshold 0.2
+  uv run python -m bench.suite --rows 100000 --compare --rounds 5 --threshold 0.5
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from bench.synthetic_data import ensure_table
+
+BASELINE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+SEARCH_KEYWORDS = ["삼성전자", "반도체", "HBM", "목표주가"]
+# trigram 인덱스를 쓰지 못하는 2글자 검색어 (LIKE 경로)
+SHORT_KEYWORDS = ["조선", "방산"]
+# 측정 잡음으로 회귀 판정이 나지 않도록 하는 최소 증가량
+MIN_REGRESSION_DELTA = {"p50_ms": 0.5, "peak_mib": 1.0}
+
+
+def percentile(sorted_values, q):
+    """정렬된 값의 q 분위수 (선형 보간)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def run_case(name, func, iterations, warmup=1, rounds=1):
+    """
+    func 를 iterations 회씩 rounds 번 실행해 지연 분포를 측정하고, 한 번 더 tracemalloc 아래에서 실행해 최대 메모리를 잽니다.
+    라운드 중 p50 이 가장 낮은 라운드를 결과로 사용합니다. (min-of-N: 공유 러너의 일시적인 잡음 제외)
+    func 가 정수를 반환하면 처리한 행 수로 보고 rows/s 를 계산합니다.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            func()
+        best = None
+        for _ in range(rounds):
+            latencies = []
+            processed = 0
+            for _ in range(iterations):
+                started = time.perf_counter()
+                result = func()
+                latencies.append(time.perf_counter() - started)
+                if isinstance(result, int):
+                    processed += result
+            latencies.sort()
+            if best is None or percentile(latencies, 0.50) < percentile(best[0], 0.50):
+                best = (latencies, processed)
+
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies, processed = best
+    total = sum(latencies)
+    return {
+        "name": name,
+        "iterations": iterations,
+        "ops_per_sec": iterations / total if total else 0.0,
+        "rows_per_sec": processed / total if total and processed else None,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "peak_mib": peak / 1024 / 1024,
+    }
+
+
+def load_app(db_path, workdir, use_oracle=False):
+    """SQLITE_PATH 를 합성 DB 로 지정한 뒤 app 모듈을 import (스냅샷 파일은 workdir 아래에 기록)"""
+    os.environ["SQLITE_PATH"] = db_path
+    # 실행 중인 서버와 리더 잠금을 다투지 않도록 작업 폴더의 잠금 파일 사용
+    os.environ["REFRESH_LOCK_PATH"] = os.path.join(workdir, "refresh.lock")
+    os.chdir(workdir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as app_module
+    if not use_oracle:
+        from model.SQLiteManager import SQLiteManagerSQL
+        app_module.OracleManagerSQL = SQLiteManagerSQL
+    return app_module
+
+
+def build_cases(app_module, iterations):
+    """(이름, 함수, 반복 횟수) 목록"""
+    from model.SQLiteManager import SQLiteManagerSQL
+    from service.ReportCache import IncrementalGroupedCache, ReportSnapshotBuilder
+    from service.ReportTransform import save_time_date, reg_dt_date, is_global_report
+
+    client = app_module.app.test_client()
+    db = SQLiteManagerSQL()
+    max_id = db.fetch_global_articles_by_id(0, limit=1)[0].id
+    db.close_connection()
+
+    def full_build():
+        views = {
+            "recent_reports": IncrementalGroupedCache(save_time_date, days_before=3),
+            "daily_group_reports": IncrementalGroupedCache(reg_dt_date, days_before=3),
+            "daily_global_reports": IncrementalGroupedCache(save_time_date, days_before=14, row_filter=is_global_report),
+        }
+        db = SQLiteManagerSQL()
+        ReportSnapshotBuilder(views).refresh(db)
+        db.close_connection()
+
+    def fetch_global(last_id):
+        def run():
+            db = SQLiteManagerSQL()
+            rows = db.fetch_global_articles_by_id(last_id)
+            db.close_connection()
+            return len(rows)
+        return run
+
+    def search(keywords):
+        position = [0]
+
+        def run():
+            keyword = keywords[position[0] % len(keywords)]
+            position[0] += 1
+            db = SQLiteManagerSQL()
+            rows = db.search_reports_by_keyword(keyword, 0, 31)
+            db.close_connection()
+            return len(rows)
+        return run
+
+    def get(url, before=None):
+        def run():
+            if before is not None:
+                before()
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+        return run
+
+    def invalidate_search_cache():
+        app_module.search_cache.invalidate(object())
+
+    rebuild_iterations = max(3, iterations // 10)
+    return [
+        ("cache.full_build", full_build, rebuild_iterations),
+        ("cache.refresh_unchanged", app_module.refresh_all_caches, iterations),
+        ("db.fetch_global_articles_by_id(0)", fetch_global(0), iterations),
+        ("db.fetch_global_articles_by_id(mid)", fetch_global(max_id // 2), iterations),
+        ("db.search_reports_by_keyword(fts)", search(SEARCH_KEYWORDS), iterations),
+        ("db.search_reports_by_keyword(like)", search(SHORT_KEYWORDS), iterations),
+        ("route./", get("/"), iterations),
+        ("route./report/daily_group", get("/report/daily_group"), iterations),
+        ("route./reports/global/0", get("/reports/global/0"), iterations),
+        ("route./reports/search(cold)", get("/reports/search?keyword=삼성전자", invalidate_search_cache), iterations),
+        ("route./reports/search(cached)", get("/reports/search?keyword=삼성전자"), iterations),
+    ]
+
+
+def print_results(results, baseline=None):
+    print(f"{'case':<38}{'ops/s':>10}{'rows/s':>12}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'peak(MiB)':>11}{'vs base':>9}")
+    for result in results:
+        rows_per_sec = f"{result['rows_per_sec']:,.0f}" if result["rows_per_sec"] else "-"
+        change = "-"
+        if baseline and result["name"] in baseline:
+            base_p50 = baseline[result["name"]]["p50_ms"]
+            change = f"{(result['p50_ms'] / base_p50 - 1) * 100:+.0f}%" if base_p50 else "-"
+        print(f"{result['name']:<38}{result['ops_per_sec']:>10,.1f}{rows_per_sec:>12}{result['p50_ms']:>10.2f}"
+              f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['peak_mib']:>11.2f}{change:>9}")
+
+
+def find_regressions(results, baseline, threshold):
+    """p50 지연 또는 최대 메모리가 기준 대비 threshold 비율 (그리고 최소 증가량) 이상 늘어난 항목"""
+    regressions = []
+    for result in results:
+        base = baseline.get(result["name"])
+        if base is None:
+            continue
+        for metric, min_delta in MIN_REGRESSION_DELTA.items():
+            if result[metric] > base[metric] * (1 + threshold) and result[metric] - base[metric] > min_delta:
+                regressions.append(f"{result['name']} {metric}: {base[metric]:.2f} -> {result[metric]:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="레포트 서비스 벤치마크")
+    parser.add_argument("--rows", type=int, default=100_000, help="합성 행 수 (100k ~ 10M)")
+    parser.add_argument("--db", help="합성 DB 경로 (기본: 임시 폴더의 bench-<rows>.db, 같은 행 수면 재사용)")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=1, help="항목별 측정 라운드 수 (p50 이 가장 낮은 라운드 사용)")
+    parser.add_argument("--no-fts", action="store_true", help="FTS5 인덱스 없이 측정 (LIKE 검색)")
+    parser.add_argument("--oracle", action="store_true", help="검색 라우트에 실제 OracleManagerSQL 사용")
+    parser.add_argument("--baseline", help="기준 파일 경로 (기본: bench/baselines/rows-<rows>.json)")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 판단할 증가 비율")
+    args = parser.parse_args()
+
+    baseline_path = args.baseline or os.path.join(BASELINE_FOLDER, f"rows-{args.rows}.json")
+    db_path = os.path.abspath(args.db or os.path.join(tempfile.gettempdir(), f"bench-{args.rows}.db"))
+    ensure_table(db_path, args.rows, fts=not args.no_fts)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        started = time.perf_counter()
+        app_module = load_app(db_path, workdir, use_oracle=args.oracle)
+        print(f"[벤치마크] app import + 초기 캐시 빌드 {time.perf_counter() - started:.2f}초")
+        results = [
+            run_case(name, func, iterations, rounds=args.rounds)
+            for name, func, iterations in build_cases(app_module, args.iterations)
+        ]
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(baseline_path, encoding="utf-8") as f:
+                baseline = {result["name"]: result for result in json.load(f)["results"]}
+        except OSError:
+            # 기준 없이 비교하면 회귀를 잡을 수 없으므로 통과로 처리하지 않음
+            print(f"[벤치마크] 기준 파일 없음: {baseline_path} (--save-baseline 으로 먼저 생성)")
+            sys.exit(2)
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "rows": args.rows,
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"[벤치마크] 기준 저장: {baseline_path}")
+
+    if baseline:
+        regressions = find_regressions(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"[회귀] {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+벤치마크용 합성 data_main_daily_send 테이블 생성기.
+
+- 최근 days 일에 고르게 분포한 행 (id 는 SAVE_TIME 순)
+- 종목/업종/키워드를 조합한 한글 레포트 제목
+- 대형사 위주로 치우친 증권사 분포 (해외 증권사는 해외 MKT_TP)
+- MKT_TP / MAIN_CH_SEND_YN 비율, 텔레그램 링크 미발송 비율 조정 가능
+
+사용법: uv run python -m bench.synthetic_data --rows 1000000 --db /tmp/bench.db [--fts]
+"""
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from model.SQLiteSchema import ensure_indexes
+
+FIRMS = ["삼성증권", "미래에셋증권", "키움증권", "NH투자증권", "한국투자증권", "KB증권", "신한투자증권",
+         "하나증권", "메리츠증권", "대신증권", "JP Morgan", "Goldman Sachs", "Morgan Stanley", "Nomura"]
+# 증권사별 상대 발간 비중 (대형 국내사가 많고 해외사는 적음)
+FIRM_WEIGHTS = [14, 13, 11, 11, 10, 9, 8, 7, 5, 4, 3, 2, 2, 1]
+FOREIGN_FIRMS = {"JP Morgan", "Goldman Sachs", "Morgan Stanley", "Nomura"}
+
+# 국내사 레포트의 해외(MKT_TP <> 'KR') 비중과 해외 시장 분포
+DEFAULT_GLOBAL_RATIO = 0.3
+GLOBAL_MARKETS = ["US", "US", "US", "CN", "JP", "GL"]
+DEFAULT_SEND_RATIO = 0.7
+# 아직 텔레그램 발송 전(링크 없음)인 최근 행 비율
+DEFAULT_PENDING_RATIO = 0.02
+
+STOCKS = ["삼성전자", "SK하이닉스", "LG에너지솔루션", "현대차", "기아", "NAVER", "카카오", "셀트리온", "POSCO홀딩스",
+          "삼성바이오로직스", "LG화학", "한화에어로스페이스", "HD현대중공업", "KB금융", "신한지주", "엔비디아", "애플",
+          "테슬라", "마이크로소프트", "TSMC", "알리바바", "텐센트", "소니", "도요타"]
+SECTORS = ["반도체", "2차전지", "자동차", "조선", "방산", "은행", "보험", "화장품", "음식료", "유통", "인터넷",
+           "게임", "바이오", "건설", "철강", "화학", "유틸리티", "통신", "미디어", "운송"]
+TITLE_TEMPLATES = [
+    "{stock} {quarter} 실적 리뷰: {view}",
+    "{stock}, {topic} 모멘텀 유효",
+    "[{sector}] 주간 업황 점검 - {topic}",
+    "{sector} 산업 전망: {view}",
+    "{stock} 목표주가 상향, {topic} 수혜",
+    "{stock} 탐방 노트: {topic}",
+    "{quarter} {sector} 프리뷰 - {view}",
+    "글로벌 {sector} 동향: {stock} 중심으로",
+]
+TOPICS = ["HBM", "AI 서버", "금리 인하", "환율", "수출 회복", "밸류업", "배당 확대", "신규 수주", "재고 조정",
+          "가격 인상", "CAPEX", "구조조정", "점유율 확대", "마진 개선", "규제 완화"]
+VIEWS = ["기대치 상회", "컨센서스 부합", "눈높이 조정 필요", "바닥 통과", "하반기 개선", "Buy 유지", "비중 확대"]
+QUARTERS = ["1Q25", "2Q25", "3Q25", "4Q25"]
+
+SCHEMA = """
+    CREATE TABLE data_main_daily_send (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        SEC_FIRM_ORDER INTEGER,
+        ARTICLE_BOARD_ORDER INTEGER,
+        FIRM_NM TEXT,
+        REG_DT TEXT,
+        ATTACH_URL TEXT,
+        ARTICLE_TITLE TEXT,
+        ARTICLE_URL TEXT,
+        MAIN_CH_SEND_YN TEXT,
+        DOWNLOAD_URL TEXT,
+        WRITER TEXT,
+        SAVE_TIME TEXT,
+        TELEGRAM_URL TEXT,
+        KEY TEXT UNIQUE,
+        MKT_TP TEXT
+    )
+"""
+
+INSERT_SQL = (
+    "INSERT INTO data_main_daily_send (SEC_FIRM_ORDER, ARTICLE_BOARD_ORDER, FIRM_NM, REG_DT, ATTACH_URL, "
+    "ARTICLE_TITLE, ARTICLE_URL, MAIN_CH_SEND_YN, DOWNLOAD_URL, WRITER, SAVE_TIME, TELEGRAM_URL, KEY, MKT_TP) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def random_title(rng):
+    """종목/업종/키워드를 조합한 한글 레포트 제목"""
+    return rng.choice(TITLE_TEMPLATES).format(
+        stock=rng.choice(STOCKS), sector=rng.choice(SECTORS), topic=rng.choice(TOPICS),
+        view=rng.choice(VIEWS), quarter=rng.choice(QUARTERS),
+    )
+
+
+def create_table(db_path, rows, days=20, seed=42, send_ratio=DEFAULT_SEND_RATIO,
+                 global_ratio=DEFAULT_GLOBAL_RATIO, pending_ratio=DEFAULT_PENDING_RATIO, batch_size=100_000):
+    """최근 days 일에 고르게 분포한 합성 data_main_daily_send 테이블과 조회 인덱스 생성 (batch_size 행마다 커밋)"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("DROP TABLE IF EXISTS data_main_daily_send")
+    conn.execute(SCHEMA)
+
+    now = datetime.now()
+    start = now - timedelta(days=days)
+    step = timedelta(days=days) / max(rows, 1)
+    firm_cum_weights = list(itertools.accumulate(FIRM_WEIGHTS))
+    firm_orders = {firm: order for order, firm in enumerate(FIRMS)}
+    pending_from = rows - int(rows * pending_ratio)
+
+    def generate():
+        for i in range(rows):
+            saved_at = start + step * i
+            firm = rng.choices(FIRMS, cum_weights=firm_cum_weights)[0]
+            if firm in FOREIGN_FIRMS or rng.random() < global_ratio:
+                mkt_tp = rng.choice(GLOBAL_MARKETS)
+            else:
+                mkt_tp = "KR"
+            yield (
+                firm_orders[firm], rng.randrange(5), firm, saved_at.strftime('%Y%m%d'),
+                f"https://example.com/attach/{i}", random_title(rng),
+                f"https://example.com/article/{i}", "Y" if rng.random() < send_ratio else "N", None,
+                f"작성자{rng.randrange(300)}", saved_at.strftime('%Y-%m-%dT%H:%M:%S.%f'),
+                "" if i >= pending_from else f"https://t.me/report/{i}", f"key-{i}", mkt_tp,
+            )
+
+    generator = generate()
+    while True:
+        batch = list(itertools.islice(generator, batch_size))
+        if not batch:
+            break
+        with conn:
+            conn.executemany(INSERT_SQL, batch)
+    conn.close()
+    # 운영 DB 처럼 조회 인덱스를 미리 만들어 둠 (워커는 인덱스를 만들지 않음)
+    ensure_indexes(db_path)
+
+
+def row_count(db_path):
+    """기존 합성 DB 의 행 수 (없거나 테이블이 없으면 None)"""
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM data_main_daily_send").fetchone()[0]
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+
+def ensure_table(db_path, rows, fts=False, **options):
+    """같은 행 수의 합성 DB 가 이미 있으면 재사용, 없으면 생성 (수백만 행 재생성 방지)"""
+    created = row_count(db_path) != rows
+    if not created:
+        print(f"[합성 데이터] 기존 DB 재사용: {db_path} ({rows:,}행)")
+    if created:
+        started = time.perf_counter()
+        create_table(db_path, rows, **options)
+        print(f"[합성 데이터] {rows:,}행 생성 완료 ({time.perf_counter() - started:.1f}초): {db_path}")
+    if fts:
+        from model.SQLiteSearchIndex import SQLiteSearchIndex
+        index = SQLiteSearchIndex(db_path)
+        # 테이블을 새로 만들었으면 기존 색인은 무효이므로 재색인
+        index.build(rebuild=created)
+        index.close_connection()
+    return db_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="합성 data_main_daily_send 테이블 생성")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--db", required=True)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--send-ratio", type=float, default=DEFAULT_SEND_RATIO)
+    parser.add_argument("--global-ratio", type=float, default=DEFAULT_GLOBAL_RATIO)
+    parser.add_argument("--fts", action="store_true", help="FTS5 검색 인덱스도 생성")
+    args = parser.parse_args()
+
+    ensure_table(args.db, args.rows, fts=args.fts, days=args.days, seed=args.seed,
+                 send_ratio=args.send_ratio, global_ratio=args.global_ratio)
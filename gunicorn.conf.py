@@ -0,0 +1,22 @@
+# gunicorn 은 작업 디렉토리의 gunicorn.conf.py 를 자동으로 읽습니다. (실행 옵션은 Dockerfile CMD 참고)
+import os
+import shutil
+
+# 워커당 요청 처리 스레드 수. 1 보다 크면 gthread 워커로 동작해 Oracle/SQLite 조회를 기다리는 동안에도
+# 같은 워커가 다른 요청을 처리합니다. (DB 드라이버는 I/O 중 GIL 을 놓음)
+threads = int(os.getenv("GUNICORN_THREADS", 1))
+
+
+def on_starting(server):
+    """마스터 시작 시 이전 실행의 멀티 프로세스 메트릭 파일 정리"""
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """종료된 워커의 gauge 값이 /metrics 에 남지 않도록 정리"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
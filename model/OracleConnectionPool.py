@@ -0,0 +1,132 @@
+import threading
+import time
+import oracledb
+from service.Metrics import CONNECTIONS_OPENED, CONNECTIONS_REUSED, CONNECTION_ACQUIRE_DURATION, CONNECTION_RECONNECTS
+
+# 커넥션이 끊겨 다른 커넥션으로 다시 시도해도 되는 오류 (네트워크 단절, 세션 종료, 유휴 타임아웃 등)
+RECONNECT_ERROR_CODES = {
+    "DPY-1001",  # not connected
+    "DPY-4011",  # the database or network closed the connection
+    "ORA-00028",  # your session has been killed
+    "ORA-01012",  # not logged on
+    "ORA-03113",  # end-of-file on communication channel
+    "ORA-03114",  # not connected to ORACLE
+    "ORA-03135",  # connection lost contact
+    "DPI-1080",  # connection was closed by ORA-%d
+}
+
+
+def is_connection_error(error):
+    """끊긴 커넥션 때문에 난 오류인지 (같은 쿼리를 새 커넥션으로 한 번 더 시도해도 되는지)"""
+    if not isinstance(error, oracledb.Error) or not error.args:
+        return False
+    detail = error.args[0]
+    return getattr(detail, "isrecoverable", False) or getattr(detail, "full_code", None) in RECONNECT_ERROR_CODES
+
+
+def output_type_handler(cursor, metadata):
+    """CLOB/NCLOB 은 LOB 객체 대신 바로 문자열로 받음 (행마다 .read() 왕복 방지)"""
+    if metadata.type_code is oracledb.DB_TYPE_CLOB:
+        return cursor.var(oracledb.DB_TYPE_LONG, arraysize=cursor.arraysize)
+    if metadata.type_code is oracledb.DB_TYPE_NCLOB:
+        return cursor.var(oracledb.DB_TYPE_LONG_NVARCHAR, arraysize=cursor.arraysize)
+    return None
+
+
+class OracleConnectionPool:
+    """
+    프로세스 전역 oracledb 세션 풀 (gunicorn 워커별 1개).
+
+    - 요청마다 지갑/TLS 연결을 새로 맺는 대신 min~max 개의 세션을 유지하고 increment 개씩 늘립니다.
+    - 세션마다 statement cache(stmtcachesize)를 두어 반복 쿼리의 parse 를 줄입니다.
+    - ping_interval 초 이상 놀던 세션은 꺼낼 때 ping 으로 확인하고, 쿼리 도중 끊긴 세션은 drop() 후 다시 받습니다.
+    - 풀이 가득 차면 wait_timeout_ms 까지만 기다립니다. (gthread 스레드가 무한정 쌓이지 않도록)
+    - 풀 생성에 실패하면(DB 점검 등) 다음 acquire 에서 다시 만듭니다.
+    """
+
+    def __init__(self, user, password, dsn, config_dir=None, wallet_location=None, wallet_password=None,
+                 min_sessions=1, max_sessions=8, increment=1, stmtcachesize=50,
+                 ping_interval=60, wait_timeout_ms=5000, idle_timeout=300):
+        self.params = {
+            "user": user,
+            "password": password,
+            "dsn": dsn,
+            "config_dir": config_dir,
+            "wallet_location": wallet_location,
+            "wallet_password": wallet_password,
+        }
+        self.min_sessions = min_sessions
+        self.max_sessions = max_sessions
+        self.increment = increment
+        self.stmtcachesize = stmtcachesize
+        self.ping_interval = ping_interval
+        self.wait_timeout_ms = wait_timeout_ms
+        self.idle_timeout = idle_timeout
+        self._pool = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _on_new_session(self, conn, requested_tag):
+        """새 세션이 만들어질 때만 호출됨 (재사용 세션과 구분해 카운트)"""
+        self._local.new_session = True
+        CONNECTIONS_OPENED.labels("oracle").inc()
+
+    def open(self):
+        """풀 생성 (이미 있으면 그대로). 풀 생성에 실패했으면 다음 acquire 에서 다시 호출됨"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = oracledb.create_pool(
+                    **self.params,
+                    min=self.min_sessions,
+                    max=self.max_sessions,
+                    increment=self.increment,
+                    getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                    wait_timeout=self.wait_timeout_ms,
+                    timeout=self.idle_timeout,
+                    ping_interval=self.ping_interval,
+                    stmtcachesize=self.stmtcachesize,
+                    session_callback=self._on_new_session,
+                )
+            return self._pool
+
+    def acquire(self):
+        """풀에서 세션을 꺼냄 (대기 + 생성 시간을 db_connection_acquire_seconds 로 기록)"""
+        started = time.perf_counter()
+        self._local.new_session = False
+        conn = self.open().acquire()
+        CONNECTION_ACQUIRE_DURATION.labels("oracle").observe(time.perf_counter() - started)
+        if not self._local.new_session:
+            CONNECTIONS_REUSED.labels("oracle").inc()
+        conn.outputtypehandler = output_type_handler
+        return conn
+
+    def release(self, conn):
+        self._pool.release(conn)
+
+    def discard(self, conn):
+        """끊긴 세션을 풀에서 제거 (다음 acquire 는 새 세션을 받음)"""
+        CONNECTION_RECONNECTS.labels("oracle").inc()
+        try:
+            self._pool.drop(conn)
+        except oracledb.Error:
+            pass
+
+    def ping(self):
+        """풀을 열고 세션 하나를 꺼내 DB 왕복 확인 (워커 시작 시 호출)"""
+        conn = self.acquire()
+        try:
+            conn.ping()
+        finally:
+            self.release(conn)
+
+    def stats(self):
+        pool = self._pool
+        if pool is None:
+            return {"opened": 0, "busy": 0, "max": self.max_sessions}
+        return {"opened": pool.opened, "busy": pool.busy, "max": pool.max}
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close(force=True)
+                self._pool = None
@@ -2,6 +2,9 @@ import oracledb
 import os
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
+from model.ReportRow import ReportRow, REPORT_COLUMNS
+from model.OracleConnectionPool import OracleConnectionPool, is_connection_error
+from service.Metrics import observe_query
 
 # Load environment variables
 load_dotenv()
@@ -13,40 +16,75 @@ DB_USER = os.getenv('DB_USER')                  # Oracle 사용자 이름
 DB_PASSWORD = os.getenv('DB_PASSWORD')          # Oracle 비밀번호
 DB_DSN = os.getenv('DB_DSN')                    # tnsnames.ora의 TNS 별칭
 
+# 일자 범위 조회처럼 행이 많은 쿼리의 fetch 크기 (왕복 횟수 감소)
+WINDOW_ARRAYSIZE = 1000
+
+# 프로세스 전역 세션 풀 (워커 시작 시 pool.open(), 요청마다 acquire/release)
+pool = OracleConnectionPool(
+    DB_USER,
+    DB_PASSWORD,
+    DB_DSN,
+    config_dir=WALLET_LOCATION,
+    wallet_location=WALLET_LOCATION,
+    wallet_password=WALLET_PASSWORD,
+    min_sessions=int(os.getenv('ORACLE_POOL_MIN', 1)),
+    max_sessions=int(os.getenv('ORACLE_POOL_MAX', 8)),
+    increment=int(os.getenv('ORACLE_POOL_INCREMENT', 1)),
+    stmtcachesize=int(os.getenv('ORACLE_STMT_CACHE_SIZE', 50)),
+    ping_interval=int(os.getenv('ORACLE_POOL_PING_INTERVAL', 60)),
+    wait_timeout_ms=int(os.getenv('ORACLE_POOL_WAIT_TIMEOUT_MS', 5000)),
+)
+
 class OracleManagerSQL:
     def __init__(self):
-        # Oracle Wallet을 사용한 연결 설정
-        self.conn = oracledb.connect(
-            user=DB_USER,
-            password=DB_PASSWORD,
-            dsn=DB_DSN,
-            config_dir=WALLET_LOCATION,
-            wallet_location=WALLET_LOCATION,
-            wallet_password=WALLET_PASSWORD
-        )
+        # 풀에서 Oracle Wallet 세션을 받아 사용 (연결은 풀이 유지)
+        self.conn = pool.acquire()
         self.cursor = self.conn.cursor()
 
     def close_connection(self):
-        self.conn.close()
+        # 실제로 닫지 않고 풀에 반환
+        self.cursor.close()
+        pool.release(self.conn)
 
+    def _fetch(self, query, params, arraysize=100, prefetchrows=2):
+        """
+        쿼리 형태에 맞춘 fetch 크기로 실행 후 전체 행 반환.
+        세션이 끊겨 있으면 풀에서 버리고 새 세션으로 한 번만 다시 시도합니다.
+        """
+        for attempt in range(2):
+            try:
+                self.cursor.arraysize = arraysize
+                self.cursor.prefetchrows = prefetchrows
+                self.cursor.execute(query, params)
+                return self.cursor.fetchall()
+            except oracledb.Error as e:
+                if attempt or not is_connection_error(e):
+                    raise
+                print(f"[Oracle] 끊긴 세션 재연결 후 재시도: {e}")
+                pool.discard(self.conn)
+                self.conn = pool.acquire()
+                self.cursor = self.conn.cursor()
+
+    @observe_query("oracle")
     def fetch_last_modified_time(self):
         """SAVE_TIME 컬럼에서 가장 최근 시간을 반환"""
         query = "SELECT MAX(SAVE_TIME) FROM data_main_daily_send"
-        self.cursor.execute(query)
-        result = self.cursor.fetchone()
+        rows = self._fetch(query, [], arraysize=1, prefetchrows=2)
+        result = rows[0] if rows else None
         if result and result[0]:
             # Oracle에서 반환되는 datetime 객체를 그대로 사용
             return result[0] if isinstance(result[0], datetime) else datetime.fromisoformat(result[0])
         return None
 
+    @observe_query("oracle")
     def fetch_daily_articles_by_date(self, firm_info=None, date_str=None):
         """Fetch articles by date."""
         query_date = date_str if date_str else datetime.now().strftime('%Y%m%d')
         three_days_ago = (datetime.strptime(query_date, '%Y%m%d') - timedelta(days=3)).strftime('%Y%m%d')
         two_days_after = (datetime.strptime(query_date, '%Y%m%d') + timedelta(days=2)).strftime('%Y%m%d')
 
-        query = """
-            SELECT * FROM data_main_daily_send
+        query = f"""
+            SELECT {REPORT_COLUMNS} FROM data_main_daily_send
             WHERE REG_DT BETWEEN :1 AND :2
         """
         params = [three_days_ago, two_days_after]
@@ -56,21 +94,19 @@ class OracleManagerSQL:
             params.append(firm_info['SEC_FIRM_ORDER'])
 
         query += " ORDER BY id DESC, REG_DT DESC, SEC_FIRM_ORDER, ARTICLE_BOARD_ORDER"
-        self.cursor.execute(query, params)
+        rows = self._fetch(query, params, arraysize=WINDOW_ARRAYSIZE, prefetchrows=WINDOW_ARRAYSIZE)
 
-        # Oracle은 컬럼 이름과 함께 결과를 반환
-        columns = [col[0] for col in self.cursor.description]
-        results = self.cursor.fetchall()
-        return [dict(zip(columns, row)) for row in results]
+        return list(map(ReportRow._make, rows))
 
+    @observe_query("oracle")
     def fetch_articles_by_todate(self, firm_info=None, date_str=None):
         """Fetch articles by date."""
         query_date = date_str if date_str else datetime.now().strftime('%Y%m%d')
         three_days_ago = (datetime.strptime(query_date, '%Y%m%d') - timedelta(days=3)).strftime('%Y%m%d')
         two_days_after = (datetime.strptime(query_date, '%Y%m%d') + timedelta(days=2)).strftime('%Y%m%d')
 
-        query = """
-            SELECT * FROM data_main_daily_send
+        query = f"""
+            SELECT {REPORT_COLUMNS} FROM data_main_daily_send
             WHERE REG_DT BETWEEN :1 AND :2
         """
         params = [three_days_ago, two_days_after]
@@ -80,51 +116,72 @@ class OracleManagerSQL:
             params.append(firm_info['SEC_FIRM_ORDER'])
 
         query += " ORDER BY id DESC, REG_DT DESC"
-        self.cursor.execute(query, params)
+        rows = self._fetch(query, params, arraysize=WINDOW_ARRAYSIZE, prefetchrows=WINDOW_ARRAYSIZE)
 
-        columns = [col[0] for col in self.cursor.description]
-        results = self.cursor.fetchall()
-        return [dict(zip(columns, row)) for row in results]
+        return list(map(ReportRow._make, rows))
 
-    def search_reports_by_keyword(self, keyword, last_id, offset, limit=30):
+    @observe_query("oracle")
+    def search_reports_by_keyword(self, keyword, last_id=0, limit=30):
         """
-        키워드로 레포트를 검색하고 페이징 처리합니다.
+        키워드로 레포트를 id 내림차순 keyset 방식으로 검색합니다. (SQLiteManagerSQL 과 같은 계약)
+        :param last_id: 이전 페이지의 마지막 id (0 이면 첫 페이지)
+        :param limit: 최대 조회 건수 (FETCH FIRST)
         """
 
         query = """
-            SELECT REPORT_ID, ARTICLE_TITLE, TELEGRAM_URL, WRITER, SAVE_TIME, FIRM_NM
+            SELECT REPORT_ID, ARTICLE_TITLE, TELEGRAM_URL, WRITER, SAVE_TIME, REG_DT, FIRM_NM, MAIN_CH_SEND_YN, MKT_TP
             FROM data_main_daily_send
             WHERE CONTAINS(ARTICLE_TITLE, :keyword, 1) > 0
-            AND (
-                (:last_id = 0 AND REPORT_ID > 0) OR
-                (:last_id > 0 AND REPORT_ID < :last_id)
-            )
-            ORDER BY REPORT_ID DESC
-            FETCH FIRST :limit ROWS ONLY
         """
+        params = {"limit": limit, "keyword": keyword}
 
-        params = {"last_id": last_id, "limit": limit, "keyword": keyword}
-
-        print("Executing Query:", query)
-        print("With Parameters:", params)
+        if last_id:
+            query += " AND REPORT_ID < :last_id"
+            params["last_id"] = last_id
 
-        self.cursor.execute(query, params)
-        columns = [col[0] for col in self.cursor.description]
-        results = self.cursor.fetchall()
+        query += " ORDER BY REPORT_ID DESC FETCH FIRST :limit ROWS ONLY"
 
-        print("Fetched Results:", results)
+        # 한 페이지(limit 건)를 첫 왕복에 모두 받도록 prefetch (+1 은 끝 확인용)
+        results = self._fetch(query, params, arraysize=limit, prefetchrows=limit + 1)
 
-        return [dict(zip(columns, row)) for row in results]
+        # REPORT_ID 는 ReportRow.id 로 매핑 (SQLiteManagerSQL 과 같은 행 형태)
+        return list(map(ReportRow._make, results))
 
 
+    @observe_query("oracle")
+    def fetch_replica_rows(self, last_id=0, limit=1000, saved_since=None, until_id=None):
+        """
+        로컬 SQLite 복제본 동기화용: REPORT_ID 오름차순 keyset 으로 limit 건씩 조회
+        :param last_id: 이전 배치의 마지막 REPORT_ID
+        :param saved_since: 주어지면 SAVE_TIME 이 이 시각 이후인 행만 (이미 받은 최근 행의 변경 재확인용)
+        :param until_id: 주어지면 이 REPORT_ID 이하만
+        """
+        query = """
+            SELECT REPORT_ID, ARTICLE_TITLE, TELEGRAM_URL, WRITER, SAVE_TIME, REG_DT, FIRM_NM, MAIN_CH_SEND_YN, MKT_TP
+            FROM data_main_daily_send
+            WHERE REPORT_ID > :last_id
+        """
+        params = {"last_id": last_id, "limit": limit}
+        if saved_since is not None:
+            query += " AND SAVE_TIME >= :saved_since"
+            params["saved_since"] = saved_since
+        if until_id is not None:
+            query += " AND REPORT_ID <= :until_id"
+            params["until_id"] = until_id
+        query += " ORDER BY REPORT_ID FETCH FIRST :limit ROWS ONLY"
+
+        rows = self._fetch(query, params, arraysize=limit, prefetchrows=limit + 1)
+        return list(map(ReportRow._make, rows))
+
+    @observe_query("oracle")
     def fetch_global_articles_by_todate(self, firm_info=None, date_str=None):
         """Fetch articles by date."""
         query_date = date_str if date_str else datetime.now().strftime('%Y%m%d')
         three_days_ago = (datetime.strptime(query_date, '%Y%m%d') - timedelta(days=14)).strftime('%Y%m%d')
         two_days_after = (datetime.strptime(query_date, '%Y%m%d') + timedelta(days=2)).strftime('%Y%m%d')
 
-        query = """
-            SELECT * FROM data_main_daily_send
+        query = f"""
+            SELECT {REPORT_COLUMNS} FROM data_main_daily_send
             WHERE MAIN_CH_SEND_YN = 'Y'
             AND MKT_TP != 'KR'
             AND REG_DT BETWEEN :1 AND :2
@@ -132,15 +189,14 @@ class OracleManagerSQL:
         """
         params = [three_days_ago, two_days_after]
 
-        self.cursor.execute(query, params)
-        columns = [col[0] for col in self.cursor.description]
-        results = self.cursor.fetchall()
-        return [dict(zip(columns, row)) for row in results]
+        rows = self._fetch(query, params, arraysize=WINDOW_ARRAYSIZE, prefetchrows=WINDOW_ARRAYSIZE)
+        return list(map(ReportRow._make, rows))
 
+    @observe_query("oracle")
     def fetch_global_articles_by_id(self, last_id=0, limit=10):
         """Fetch articles by date."""
-        query = """
-            SELECT * FROM data_main_daily_send
+        query = f"""
+            SELECT {REPORT_COLUMNS} FROM data_main_daily_send
             WHERE MAIN_CH_SEND_YN = 'Y'
             AND MKT_TP != 'KR'
         """
@@ -153,10 +209,8 @@ class OracleManagerSQL:
         query += " ORDER BY id DESC FETCH FIRST :2 ROWS ONLY"
         params.append(limit)
 
-        self.cursor.execute(query, params)
-        columns = [col[0] for col in self.cursor.description]
-        results = self.cursor.fetchall()
-        return [dict(zip(columns, row)) for row in results] if results else []
+        rows = self._fetch(query, params, arraysize=limit, prefetchrows=limit + 1)
+        return list(map(ReportRow._make, rows))
 
 # Example Usage
 if __name__ == "__main__":
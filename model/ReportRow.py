@@ -0,0 +1,21 @@
+from typing import NamedTuple
+
+
+class ReportRow(NamedTuple):
+    """
+    data_main_daily_send 에서 앱이 사용하는 컬럼만 담는 행.
+    튜플 기반이라 컬럼명을 행마다 들고 있는 dict 보다 훨씬 작습니다.
+    """
+    id: int
+    ARTICLE_TITLE: str
+    TELEGRAM_URL: str
+    WRITER: str
+    SAVE_TIME: object  # SQLite: ISO 문자열, Oracle: datetime
+    REG_DT: str
+    FIRM_NM: str
+    MAIN_CH_SEND_YN: str
+    MKT_TP: str
+
+
+# SELECT 절에 사용할 컬럼 목록 (ReportRow 필드 순서와 동일)
+REPORT_COLUMNS = ", ".join(ReportRow._fields)
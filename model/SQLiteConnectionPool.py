@@ -0,0 +1,68 @@
+import sqlite3
+import threading
+from service.Metrics import CONNECTIONS_OPENED, CONNECTIONS_REUSED
+
+
+class SQLiteConnectionPool:
+    """
+    스레드별로 하나의 읽기 전용 SQLite 커넥션을 만들어 재사용합니다.
+
+    - file:...?mode=ro + PRAGMA query_only 로 열어 실수로라도 쓰기가 일어나지 않습니다.
+    - WAL 모드 DB 에서도 쓰는 쪽(수집기)을 막지 않도록 busy_timeout 만 두고 잠금을 잡지 않습니다.
+    - mmap_size / cache_size 를 키우고 prepared statement 캐시를 넓혀 반복 쿼리 비용을 줄입니다.
+    """
+
+    def __init__(self, db_path, mmap_size=256 * 1024 * 1024, cache_size_kb=64 * 1024,
+                 cached_statements=256, busy_timeout_ms=5000):
+        self.db_path = db_path
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.cached_statements = cached_statements
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            cached_statements=self.cached_statements,
+        )
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kb)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def acquire(self):
+        """현재 스레드의 커넥션을 반환 (없으면 새로 연결)"""
+        conn = getattr(self._local, "conn", None)
+        with self._stats_lock:
+            if conn is None:
+                self.opened += 1
+            else:
+                self.reused += 1
+        (CONNECTIONS_OPENED if conn is None else CONNECTIONS_REUSED).labels("sqlite").inc()
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def release(self, conn):
+        """커넥션은 스레드에 남겨 두고 재사용. 열린 트랜잭션만 정리"""
+        if conn.in_transaction:
+            conn.rollback()
+
+    def stats(self):
+        with self._stats_lock:
+            return {"opened": self.opened, "reused": self.reused}
+
+
+def connect_writable(db_path, busy_timeout_ms=5000):
+    """인덱스/스키마 관리 작업용 쓰기 커넥션 (요청 처리 경로에서는 사용하지 않음)"""
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+    return conn
@@ -1,7 +1,10 @@
-import sqlite3
 import os
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
+from model.SQLiteConnectionPool import SQLiteConnectionPool
+from model.ReportRow import ReportRow, REPORT_COLUMNS
+from service.Metrics import observe_query
+from model.SQLiteSearchIndex import FTS_TABLE, FTS_MIN_KEYWORD_LENGTH, fts_match_expression
 
 # Load environment variables
 load_dotenv()
@@ -9,14 +12,26 @@ load_dotenv()
 SQLITE_PATH = os.getenv('SQLITE_PATH')
 db_path = os.path.expanduser(SQLITE_PATH)
 
+# 프로세스 전역 커넥션 풀 (스레드별 읽기 전용 커넥션 재사용)
+pool = SQLiteConnectionPool(
+    db_path,
+    mmap_size=int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    cache_size_kb=int(os.getenv('SQLITE_CACHE_SIZE_KB', 64 * 1024)),
+)
+
 class SQLiteManagerSQL:
-    def __init__(self):
-        self.conn = sqlite3.connect(db_path)
+    def __init__(self, connection_pool=None):
+        # connection_pool 을 주면 다른 SQLite 파일(예: Oracle 복제본)을 같은 쿼리로 조회
+        self.pool = connection_pool or pool
+        self.conn = self.pool.acquire()
         self.cursor = self.conn.cursor()
 
     def close_connection(self):
-        self.conn.close()
+        # 실제로 닫지 않고 풀에 반환
+        self.cursor.close()
+        self.pool.release(self.conn)
 
+    @observe_query("sqlite")
     def fetch_last_modified_time(self):
         """SAVE_TIME 컬럼에서 가장 최근 시간을 반환"""
         query = "SELECT MAX(SAVE_TIME) FROM data_main_daily_send"
@@ -27,14 +42,15 @@ class SQLiteManagerSQL:
             return datetime.fromisoformat(result[0])
         return None
 
+    @observe_query("sqlite")
     def fetch_daily_articles_by_date(self, firm_info=None, date_str=None):
         """Fetch articles by date."""
         query_date = date_str if date_str else datetime.now().strftime('%Y%m%d')
         three_days_ago = (datetime.strptime(query_date, '%Y%m%d') - timedelta(days=3)).strftime('%Y%m%d')
         two_days_after = (datetime.strptime(query_date, '%Y%m%d') + timedelta(days=2)).strftime('%Y%m%d')
 
-        query = """
-            SELECT * FROM data_main_daily_send
+        query = f"""
+            SELECT {REPORT_COLUMNS} FROM data_main_daily_send
             WHERE REG_DT BETWEEN ? AND ?
         """
         params = [three_days_ago, two_days_after]
@@ -46,17 +62,17 @@ class SQLiteManagerSQL:
         query += " ORDER BY id DESC, REG_DT DESC, SEC_FIRM_ORDER, ARTICLE_BOARD_ORDER"
         self.cursor.execute(query, params)
 
-        results = self.cursor.fetchall()
-        return [dict(zip([column[0] for column in self.cursor.description], row)) for row in results]
+        return list(map(ReportRow._make, self.cursor.fetchall()))
 
+    @observe_query("sqlite")
     def fetch_articles_by_todate(self, firm_info=None, date_str=None):
         """Fetch articles by date."""
         query_date = date_str if date_str else datetime.now().strftime('%Y%m%d')
         three_days_ago = (datetime.strptime(query_date, '%Y%m%d') - timedelta(days=3)).strftime('%Y%m%d')
         two_days_after = (datetime.strptime(query_date, '%Y%m%d') + timedelta(days=2)).strftime('%Y%m%d')
 
-        query = """
-            SELECT * FROM data_main_daily_send
+        query = f"""
+            SELECT {REPORT_COLUMNS} FROM data_main_daily_send
             WHERE REG_DT BETWEEN ? AND ? 
         """
         params = [three_days_ago, two_days_after]
@@ -68,41 +84,133 @@ class SQLiteManagerSQL:
         query += " ORDER BY id DESC , REG_DT DESC"
         self.cursor.execute(query, params)
 
-        results = self.cursor.fetchall()
-        return [dict(zip([column[0] for column in self.cursor.description], row)) for row in results]
+        return list(map(ReportRow._make, self.cursor.fetchall()))
 
-    def search_reports_by_keyword(self, keyword, last_id, offset=0, limit=30):
+    @observe_query("sqlite")
+    def fetch_articles_since(self, from_dt, to_dt, last_id=0, prev_to_dt=None):
         """
-        키워드로 레포트를 검색하고 페이징 처리합니다.
-        :param keyword: 검색 키워드
-        :param offset: 페이징 offset
-        :param limit: 페이징 limit
-        :return: 검색 결과 리스트 (각 결과는 딕셔너리 형태)
+        REG_DT 윈도우 안에서 last_id 이후에 추가된 행을 id 내림차순으로 조회합니다. (증분 캐시 갱신용)
+        :param prev_to_dt: 이전 갱신 시 윈도우 끝 날짜. 윈도우가 밀리며 새로 포함된 일자의 행도 함께 조회
         """
-        query = """
-            SELECT id, ARTICLE_TITLE, TELEGRAM_URL, WRITER, SAVE_TIME, FIRM_NM
-            FROM data_main_daily_send
-            WHERE ARTICLE_TITLE LIKE ? 
-            AND ( ? = 0 OR id < ? )
+        if not last_id:
+            query = f"""
+                SELECT {REPORT_COLUMNS} FROM data_main_daily_send
+                WHERE REG_DT BETWEEN ? AND ?
+                ORDER BY id DESC
+            """
+            self.cursor.execute(query, [from_dt, to_dt])
+            return list(map(ReportRow._make, self.cursor.fetchall()))
+
+        # 새 행: id(INTEGER PRIMARY KEY) 범위로만 찾음. REG_DT 인덱스를 타면 윈도우 전체를 읽고 정렬하므로
+        # +REG_DT 로 인덱스 사용을 막고 rowid 범위를 역순으로 읽음 (매 주기 새로 들어온 행 수만큼만 읽음)
+        query = f"""
+            SELECT {REPORT_COLUMNS} FROM data_main_daily_send
+            WHERE id > ? AND +REG_DT BETWEEN ? AND ?
             ORDER BY id DESC
         """
-        keyword_pattern = f"%{keyword}%"
-        params = (keyword_pattern, last_id, last_id)
+        self.cursor.execute(query, [last_id, from_dt, to_dt])
+        rows = list(map(ReportRow._make, self.cursor.fetchall()))
+
+        # 윈도우 끝이 밀리며 새로 포함된 일자의 기존 행 (날짜가 바뀐 갱신에서만 조회)
+        if prev_to_dt and prev_to_dt < to_dt:
+            # 하한을 하나로 넘겨야 REG_DT 인덱스에서 새 일자 범위만 읽음
+            lower = "REG_DT > ?" if prev_to_dt >= from_dt else "REG_DT >= ?"
+            query = f"""
+                SELECT {REPORT_COLUMNS} FROM data_main_daily_send
+                WHERE {lower} AND REG_DT <= ? AND id <= ?
+            """
+            self.cursor.execute(query, [max(prev_to_dt, from_dt), to_dt, last_id])
+            rows += map(ReportRow._make, self.cursor.fetchall())
+            rows.sort(key=lambda row: row.id, reverse=True)
+        return rows
+
+    @observe_query("sqlite")
+    def fetch_articles_by_ids(self, ids, chunk_size=500):
+        """id 목록으로 행을 다시 조회 (링크 갱신 여부 확인용)"""
+        rows = []
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            query = f"SELECT {REPORT_COLUMNS} FROM data_main_daily_send WHERE id IN ({','.join('?' * len(chunk))})"
+            self.cursor.execute(query, chunk)
+            rows.extend(map(ReportRow._make, self.cursor.fetchall()))
+        return rows
+
+    @observe_query("sqlite")
+    def fetch_max_id(self):
+        """가장 최근 행의 id (행이 없으면 0)"""
+        self.cursor.execute("SELECT MAX(id) FROM data_main_daily_send")
+        return self.cursor.fetchone()[0] or 0
+
+    @observe_query("sqlite")
+    def fetch_articles_after(self, last_id, limit=500):
+        """last_id 이후에 추가된 행을 id 오름차순으로 최대 limit 건 조회 (실시간 피드용)"""
+        query = f"""
+            SELECT {REPORT_COLUMNS} FROM data_main_daily_send
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """
+        self.cursor.execute(query, (last_id, limit))
+        return list(map(ReportRow._make, self.cursor.fetchall()))
+
+    @observe_query("sqlite")
+    def has_search_index(self):
+        """FTS5 검색 인덱스 존재 여부 (python -m model.SQLiteSearchIndex build 로 생성)"""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,))
+        return self.cursor.fetchone() is not None
+
+    @observe_query("sqlite")
+    def search_reports_by_keyword(self, keyword, last_id=0, limit=30):
+        """
+        키워드로 레포트를 id 내림차순 keyset 방식으로 검색합니다.
+        FTS5 인덱스가 있으면 인덱스로 조회하고, 없거나 검색어가 짧으면 LIKE 로 조회합니다.
+        :param keyword: 검색 키워드
+        :param last_id: 이전 페이지의 마지막 id (0 이면 첫 페이지)
+        :param limit: 최대 조회 건수 (SQL LIMIT)
+        :return: 검색 결과 리스트 (각 결과는 ReportRow)
+        """
+        params = []
+        if len(keyword) >= FTS_MIN_KEYWORD_LENGTH and self.has_search_index():
+            subquery = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ?"
+            params.append(fts_match_expression(keyword))
+            if last_id:
+                subquery += " AND rowid < ?"
+                params.append(last_id)
+            subquery += " ORDER BY rowid DESC LIMIT ?"
+            params.append(limit)
+            query = f"""
+                SELECT {REPORT_COLUMNS}
+                FROM data_main_daily_send
+                WHERE id IN ({subquery})
+                ORDER BY id DESC
+            """
+        else:
+            query = f"""
+                SELECT {REPORT_COLUMNS}
+                FROM data_main_daily_send
+                WHERE ARTICLE_TITLE LIKE ?
+            """
+            params.append(f"%{keyword}%")
+            if last_id:
+                query += " AND id < ?"
+                params.append(last_id)
+            query += " ORDER BY id DESC LIMIT ?"
+            params.append(limit)
 
         self.cursor.execute(query, params)
 
-        # 결과를 딕셔너리 리스트 형태로 반환
-        results = self.cursor.fetchall()
-        return [dict(zip([column[0] for column in self.cursor.description], row)) for row in results]
+        # 결과를 ReportRow 리스트 형태로 반환
+        return list(map(ReportRow._make, self.cursor.fetchall()))
 
+    @observe_query("sqlite")
     def fetch_global_articles_by_todate(self, firm_info=None, date_str=None):
         """Fetch articles by date."""
         query_date = date_str if date_str else datetime.now().strftime('%Y%m%d')
         three_days_ago = (datetime.strptime(query_date, '%Y%m%d') - timedelta(days=14)).strftime('%Y%m%d')
         two_days_after = (datetime.strptime(query_date, '%Y%m%d') + timedelta(days=2)).strftime('%Y%m%d')
 
-        query = """
-            SELECT * FROM data_main_daily_send
+        query = f"""
+            SELECT {REPORT_COLUMNS} FROM data_main_daily_send
             WHERE MAIN_CH_SEND_YN = 'Y' 
             AND MKT_TP <> 'KR' 
             AND REG_DT BETWEEN ? AND ?
@@ -112,14 +220,14 @@ class SQLiteManagerSQL:
         query += " ORDER BY id DESC , REG_DT DESC"
         self.cursor.execute(query, params)
 
-        results = self.cursor.fetchall()
-        return [dict(zip([column[0] for column in self.cursor.description], row)) for row in results]
+        return list(map(ReportRow._make, self.cursor.fetchall()))
 
+    @observe_query("sqlite")
     def fetch_global_articles_by_id(self, last_id=0, limit=10):
         """Fetch articles by date."""
 
-        query = """
-            SELECT * FROM data_main_daily_send
+        query = f"""
+            SELECT {REPORT_COLUMNS} FROM data_main_daily_send
             WHERE MAIN_CH_SEND_YN = 'Y' 
             AND MKT_TP <> 'KR' 
         """
@@ -133,13 +241,7 @@ class SQLiteManagerSQL:
         params.append(limit)
 
         self.cursor.execute(query, params)
-        results = self.cursor.fetchall()
-
-        # Fetch 결과가 없으면 빈 리스트 반환
-        if not results:
-            return []
-
-        return [dict(zip([column[0] for column in self.cursor.description], row)) for row in results]
+        return list(map(ReportRow._make, self.cursor.fetchall()))
 
 # Example Usage
 if __name__ == "__main__":
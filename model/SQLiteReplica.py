@@ -0,0 +1,234 @@
+import argparse
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from model.ReportRow import ReportRow
+from model.SQLiteConnectionPool import connect_writable
+from model.SQLiteSchema import ensure_indexes
+from model.SQLiteSearchIndex import SQLiteSearchIndex
+
+# Load environment variables
+load_dotenv()
+
+STATE_TABLE = "replica_state"
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS data_main_daily_send (
+        id INTEGER PRIMARY KEY,
+        ARTICLE_TITLE TEXT,
+        TELEGRAM_URL TEXT,
+        WRITER TEXT,
+        SAVE_TIME TEXT,
+        REG_DT TEXT,
+        FIRM_NM TEXT,
+        MAIN_CH_SEND_YN TEXT,
+        MKT_TP TEXT
+    )
+"""
+_columns = ReportRow._fields
+# 바뀐 행만 UPDATE (변경 없는 재조회 행은 FTS 트리거/WAL 기록을 일으키지 않음)
+UPSERT_SQL = (
+    f"INSERT INTO data_main_daily_send ({', '.join(_columns)}) VALUES ({', '.join('?' * len(_columns))}) "
+    f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in _columns[1:])} "
+    f"WHERE {' OR '.join(f'{c} IS NOT excluded.{c}' for c in _columns[1:])}"
+)
+
+
+def to_replica_row(row):
+    """Oracle 행 → 복제본 행 (SAVE_TIME 은 로컬 SQLite 와 같은 ISO 문자열)"""
+    save_time = row.SAVE_TIME
+    if isinstance(save_time, datetime):
+        save_time = save_time.isoformat(timespec='microseconds')
+    return row._replace(SAVE_TIME=save_time)
+
+
+def read_replica_state(conn):
+    """복제본 동기화 상태 ({} 이면 아직 동기화 전). 읽기 전용 커넥션으로도 조회 가능"""
+    try:
+        return dict(conn.execute(f"SELECT key, value FROM {STATE_TABLE}").fetchall())
+    except sqlite3.Error:
+        return {}
+
+
+def replica_lag_seconds(state, now=None):
+    """마지막 동기화 성공 이후 경과 시간 (초). 동기화 전이면 None"""
+    synced_at = state.get("synced_at")
+    if synced_at is None:
+        return None
+    return max((now or time.time()) - float(synced_at), 0.0)
+
+
+class ReplicaStateReader:
+    """
+    요청 경로에서 복제본 동기화 상태를 읽는 쪽 (읽기 전용 풀 사용).
+    check_interval 초 동안은 마지막으로 읽은 값을 재사용합니다.
+    """
+
+    def __init__(self, pool, check_interval=1.0):
+        self.pool = pool
+        self.check_interval = check_interval
+        self.state = {}
+        self._checked_at = None
+
+    def current(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self.state
+        self._checked_at = now
+        try:
+            conn = self.pool.acquire()
+        except sqlite3.Error:
+            # 아직 복제본 파일이 없음 (첫 동기화 전)
+            return self.state
+        try:
+            self.state = read_replica_state(conn)
+        finally:
+            self.pool.release(conn)
+        return self.state
+
+    def is_ready(self):
+        """한 번 이상 동기화되어 조회에 사용할 수 있는지"""
+        return "synced_at" in self.current()
+
+    def version(self):
+        """복제본 내용이 마지막으로 바뀐 시각 (ETag / 검색 캐시 무효화용)"""
+        return self.current().get("changed_at")
+
+    def lag(self):
+        return replica_lag_seconds(self.current())
+
+
+class SQLiteReplica:
+    """
+    Oracle data_main_daily_send 를 로컬 SQLite 파일로 증분 복제합니다. (검색/글로벌 조회용 읽기 복제본)
+
+    - REPORT_ID 워터마크 이후의 새 행을 batch_size 건씩 가져와 배치마다 하나의 트랜잭션으로 반영합니다.
+      워터마크도 같은 트랜잭션에서 기록하므로 중간에 실패해도 다음 실행이 이어서 진행합니다.
+    - SAVE_TIME 워터마크에서 lookback 만큼 이전에 저장된 행은 다시 가져와 바뀐 행만 갱신합니다.
+      (텔레그램 발송 후 링크/발송 여부가 채워지는 경우)
+    - FTS5 인덱스와 조회용 인덱스(SQLiteSchema)를 함께 유지해 SQLiteManagerSQL 의 쿼리를 그대로 사용할 수 있습니다.
+    """
+
+    def __init__(self, db_path, batch_size=1000, lookback=timedelta(hours=24)):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.lookback = lookback
+        self.conn = connect_writable(db_path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        # 스키마/인덱스/FTS 준비는 파일을 처음 열 때만 (상태 테이블은 마지막에 만들므로 있으면 모두 준비된 것)
+        if not self._has_schema():
+            self.ensure_schema()
+
+    def close_connection(self):
+        self.conn.close()
+
+    def _has_schema(self):
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (STATE_TABLE,)
+        ).fetchone() is not None
+
+    def ensure_schema(self):
+        with self.conn:
+            self.conn.execute(SCHEMA)
+        # 로컬 DB 와 같은 조회용 인덱스
+        ensure_indexes(self.db_path)
+        index = SQLiteSearchIndex(self.db_path)
+        index.build()
+        index.close_connection()
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {STATE_TABLE} (key TEXT PRIMARY KEY, value TEXT)")
+
+    def state(self):
+        return read_replica_state(self.conn)
+
+    def _save_state(self, **values):
+        self.conn.executemany(
+            f"INSERT INTO {STATE_TABLE} (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [(key, str(value)) for key, value in values.items()],
+        )
+
+    def _apply(self, rows, **state):
+        """한 배치를 하나의 트랜잭션으로 반영하고 실제로 바뀐 행 수 반환"""
+        with self.conn:
+            # rowcount 는 FTS 트리거 변경을 제외한 실제 INSERT/UPDATE 행 수
+            changed = self.conn.executemany(UPSERT_SQL, [to_replica_row(row) for row in rows]).rowcount
+            self._save_state(**state)
+        return changed
+
+    def sync(self, source):
+        """
+        source(OracleManagerSQL) 에서 새 행/최근 변경 행을 가져와 반영
+        :return: {"inserted": 새 행 수, "updated": 변경 행 수, "lag": 원본 대비 SAVE_TIME 지연(초)}
+        """
+        state = self.state()
+        watermark_id = int(state.get("max_id", 0))
+        watermark_save_time = state.get("max_save_time")
+
+        # 1) 이미 받은 행 중 최근 저장분의 변경 재확인 (워터마크 이하만)
+        updated = 0
+        if watermark_save_time:
+            saved_since = datetime.fromisoformat(watermark_save_time) - self.lookback
+            last_id = 0
+            while True:
+                rows = source.fetch_replica_rows(last_id, self.batch_size, saved_since=saved_since, until_id=watermark_id)
+                if not rows:
+                    break
+                updated += self._apply(rows)
+                last_id = rows[-1].id
+                if len(rows) < self.batch_size:
+                    break
+
+        # 2) 워터마크 이후 새 행
+        inserted = 0
+        while True:
+            rows = source.fetch_replica_rows(watermark_id, self.batch_size)
+            if not rows:
+                break
+            watermark_id = rows[-1].id
+            save_times = [to_replica_row(row).SAVE_TIME for row in rows if row.SAVE_TIME]
+            if save_times:
+                watermark_save_time = max([watermark_save_time or ""] + save_times)
+            inserted += self._apply(rows, max_id=watermark_id, max_save_time=watermark_save_time)
+            if len(rows) < self.batch_size:
+                break
+
+        source_max = source.fetch_last_modified_time()
+        lag = 0.0
+        if source_max is not None and watermark_save_time:
+            lag = max((source_max - datetime.fromisoformat(watermark_save_time)).total_seconds(), 0.0)
+        now = time.time()
+        with self.conn:
+            values = {"synced_at": now, "source_lag": lag}
+            if inserted or updated:
+                values["changed_at"] = now
+            self._save_state(**values)
+        return {"inserted": inserted, "updated": updated, "lag": lag}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Oracle → 로컬 SQLite 복제본 관리")
+    parser.add_argument("command", choices=["sync", "status"])
+    parser.add_argument("--db", default=os.getenv('REPLICA_SQLITE_PATH'), help="복제본 SQLite 경로 (기본: REPLICA_SQLITE_PATH)")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv('REPLICA_BATCH_SIZE', 1000)))
+    args = parser.parse_args()
+    if not args.db:
+        parser.error("--db 또는 REPLICA_SQLITE_PATH 가 필요합니다.")
+
+    replica = SQLiteReplica(os.path.expanduser(args.db), batch_size=args.batch_size)
+    if args.command == "sync":
+        from model.OracleManagerSQL import OracleManagerSQL
+        source = OracleManagerSQL()
+        started = time.perf_counter()
+        result = replica.sync(source)
+        source.close_connection()
+        print(f"[복제본] 새 행 {result['inserted']}건 / 변경 {result['updated']}건 / "
+              f"원본 대비 지연 {result['lag']:.0f}초 ({time.perf_counter() - started:.1f}초)")
+    else:
+        state = replica.state()
+        lag = replica_lag_seconds(state)
+        print(f"[복제본] 마지막 REPORT_ID {state.get('max_id', '-')} / 마지막 SAVE_TIME {state.get('max_save_time', '-')} / "
+              f"마지막 동기화 {lag:.0f}초 전" if lag is not None else "[복제본] 아직 동기화되지 않았습니다.")
+    replica.close_connection()
@@ -0,0 +1,176 @@
+import argparse
+import os
+import sys
+import time
+from dotenv import load_dotenv
+from model.SQLiteConnectionPool import connect_writable
+
+# Load environment variables
+load_dotenv()
+
+# 이름 → 인덱스 정의. SQLiteManagerSQL 의 조회 패턴별 인덱스
+INDEXES = {
+    # REG_DT 윈도우 조회 (캐시 갱신, 일자별 조회). id 를 포함해 증분 조건(id > ?)도 인덱스에서 처리
+    "idx_daily_send_reg_dt": "(REG_DT, id)",
+    # 글로벌 레포트 (MAIN_CH_SEND_YN = 'Y' AND MKT_TP <> 'KR') 만 담은 부분 인덱스.
+    # (MAIN_CH_SEND_YN, MKT_TP, id) 복합 인덱스는 MKT_TP <> 'KR' 이 범위 조건이라 id 순서를 줄 수 없어
+    # 'Y' 행 전체를 정렬하게 되므로, 조건을 인덱스에 넣고 id 순으로 읽다가 LIMIT 에서 멈추도록 함
+    "idx_daily_send_global": "(id) WHERE MAIN_CH_SEND_YN = 'Y' AND MKT_TP <> 'KR'",
+    # MAX(SAVE_TIME) (DB 버전 확인) 을 전체 스캔 없이 인덱스 끝에서 바로 읽음
+    "idx_daily_send_save_time": "(SAVE_TIME)",
+}
+
+
+def ensure_indexes(db_path):
+    """없는 인덱스만 생성 (이미 있으면 아무것도 하지 않음). 새로 만든 인덱스 이름 목록 반환"""
+    conn = connect_writable(db_path)
+    try:
+        existing = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'data_main_daily_send'"
+        )}
+        created = [name for name in INDEXES if name not in existing]
+        with conn:
+            for name in created:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON data_main_daily_send {INDEXES[name]}")
+        if created:
+            # 새 인덱스 통계 수집 (플래너가 REG_DT 범위 등 선택도를 알 수 있도록)
+            conn.execute("PRAGMA optimize")
+        return created
+    finally:
+        conn.close()
+
+
+def drop_indexes(db_path):
+    conn = connect_writable(db_path)
+    try:
+        with conn:
+            for name in INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+    finally:
+        conn.close()
+
+
+class _PlanCursor:
+    """execute() 를 EXPLAIN QUERY PLAN 으로 바꿔 실행하고 계획만 기록하는 커서 (조회 결과는 빈 값)"""
+
+    def __init__(self, conn, plans):
+        self.conn = conn
+        self.plans = plans
+        self.rows = []
+
+    def execute(self, query, params=()):
+        if "sqlite_master" in query:
+            # has_search_index 등 메타데이터 조회는 그대로 실행
+            self.rows = self.conn.execute(query, params).fetchall()
+            return self
+        plan = self.conn.execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+        self.plans.append((" ".join(query.split()), [row[-1] for row in plan]))
+        self.rows = []
+        return self
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else (None,)
+
+    def close(self):
+        pass
+
+
+class _PlanPool:
+    """SQLiteManagerSQL(connection_pool=...) 에 넘겨 실제 쿼리 문자열 그대로 계획을 수집"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.plans = []
+
+    def acquire(self):
+        return self
+
+    def cursor(self):
+        return _PlanCursor(self.conn, self.plans)
+
+    def release(self, conn):
+        pass
+
+
+def _hot_queries():
+    """(이름, SQLiteManagerSQL 호출, 계획에 모두 있어야 하는 인덱스/검색 단계, 임시 정렬 허용 여부) 목록"""
+    reg_dt = ("idx_daily_send_reg_dt",)
+    # 증분 조회는 id 범위(rowid)로만 새 행을 읽어야 함 (REG_DT 인덱스나 임시 정렬이 생기면 윈도우 전체를 읽음)
+    rowid_range = "INTEGER PRIMARY KEY (rowid>?)"
+    return [
+        ("fetch_last_modified_time", lambda db: db.fetch_last_modified_time(), ("idx_daily_send_save_time",), False),
+        ("fetch_articles_since(full)",
+         lambda db: db.fetch_articles_since("20250101", "20250120"), reg_dt, True),
+        ("fetch_articles_since(incremental)",
+         lambda db: db.fetch_articles_since("20250101", "20250120", 1000, "20250120"), (rowid_range,), False),
+        # 날짜 변경 시에는 새로 포함된 일자만 REG_DT 인덱스로 추가 조회 (정렬은 Python 에서)
+        ("fetch_articles_since(window edge)",
+         lambda db: db.fetch_articles_since("20250101", "20250120", 1000, "20250119"), (rowid_range, *reg_dt), False),
+        ("fetch_daily_articles_by_date",
+         lambda db: db.fetch_daily_articles_by_date(date_str="20250110"), reg_dt, True),
+        ("fetch_articles_by_todate",
+         lambda db: db.fetch_articles_by_todate(date_str="20250110"), reg_dt, True),
+        ("fetch_global_articles_by_todate",
+         lambda db: db.fetch_global_articles_by_todate(date_str="20250110"), ("idx_daily_send_",), True),
+        # keyset 페이지는 인덱스 순서대로 읽다가 LIMIT 에서 멈춰야 함 (임시 정렬이 생기면 후보 전체를 읽음)
+        ("fetch_global_articles_by_id(0)",
+         lambda db: db.fetch_global_articles_by_id(0), ("idx_daily_send_global",), False),
+        ("fetch_global_articles_by_id(last_id)",
+         lambda db: db.fetch_global_articles_by_id(1000), ("idx_daily_send_global",), False),
+    ]
+
+
+def check_query_plans(db_path):
+    """
+    핫 쿼리의 EXPLAIN QUERY PLAN 이 기대한 인덱스/검색 단계를 모두 사용하는지 확인
+    :return: [(이름, 통과 여부, 계획 문자열 목록)]
+    """
+    # SQLiteManager 는 import 시 SQLITE_PATH 를 읽으므로 (커넥션은 열지 않음) 비어 있으면 대상 DB 로 채움
+    os.environ.setdefault('SQLITE_PATH', db_path)
+    from model.SQLiteManager import SQLiteManagerSQL
+
+    conn = connect_writable(db_path)
+    results = []
+    try:
+        for name, call, expected, allow_sort in _hot_queries():
+            plan_pool = _PlanPool(conn)
+            db = SQLiteManagerSQL(connection_pool=plan_pool)
+            # observe_query 메트릭은 계획 조회 시간으로 기록되지만 CLI 에서만 사용하므로 무시
+            call(db)
+            db.close_connection()
+            details = [detail for _, plan in plan_pool.plans for detail in plan]
+            uses_index = all(any(step in detail for detail in details) for step in expected)
+            # 인덱스 없이 전체 테이블을 읽는 단계가 있으면 실패
+            full_scan = any(detail.startswith("SCAN data_main_daily_send") and "INDEX" not in detail for detail in details)
+            sorted_in_memory = any("TEMP B-TREE" in detail for detail in details)
+            results.append((name, uses_index and not full_scan and (allow_sort or not sorted_in_memory), details))
+    finally:
+        conn.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="data_main_daily_send 인덱스 관리 / 쿼리 계획 확인")
+    parser.add_argument("command", choices=["ensure", "drop", "check"])
+    parser.add_argument("--db", default=os.path.expanduser(os.getenv('SQLITE_PATH', '')))
+    args = parser.parse_args()
+
+    if args.command == "ensure":
+        started = time.perf_counter()
+        created = ensure_indexes(args.db)
+        print(f"[인덱스] 생성 {', '.join(created) or '없음 (모두 존재)'} ({time.perf_counter() - started:.2f}초)")
+    elif args.command == "drop":
+        drop_indexes(args.db)
+        print("[인덱스] 삭제 완료")
+    else:
+        failed = 0
+        for name, passed, details in check_query_plans(args.db):
+            print(f"[{'OK' if passed else 'FAIL'}] {name}")
+            for detail in details:
+                print(f"       {detail}")
+            failed += not passed
+        # 인덱스를 타지 않는 쿼리가 있으면 종료 코드 1 (배포 전 확인용)
+        sys.exit(1 if failed else 0)
@@ -0,0 +1,156 @@
+import argparse
+import os
+import sqlite3
+import time
+from dotenv import load_dotenv
+from model.SQLiteConnectionPool import connect_writable
+
+# Load environment variables
+load_dotenv()
+
+FTS_TABLE = "data_main_daily_send_fts"
+FTS_COLUMNS = ("ARTICLE_TITLE", "WRITER", "FIRM_NM")
+# trigram 토크나이저는 3글자 미만 검색어를 인덱스로 처리하지 못함
+FTS_MIN_KEYWORD_LENGTH = 3
+
+
+def fts_match_expression(keyword, fields=("ARTICLE_TITLE",)):
+    """검색어를 FTS5 MATCH 식으로 변환 (부분 문자열 일치, 따옴표 이스케이프)"""
+    phrase = '"' + keyword.replace('"', '""') + '"'
+    return "{" + " ".join(fields) + "} : " + phrase
+
+
+def supports_fts_trigram(conn):
+    """커넥션의 SQLite 가 FTS5 trigram 토크나이저를 지원하는지 (FTS5 포함 빌드 + SQLite 3.34 이상)"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts_trigram_check USING fts5(x, tokenize='trigram')")
+        conn.execute("DROP TABLE temp.fts_trigram_check")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+class SQLiteSearchIndex:
+    """
+    data_main_daily_send 의 ARTICLE_TITLE / WRITER / FIRM_NM 에 대한 FTS5(trigram) 인덱스를 관리합니다.
+
+    trigram 토크나이저를 사용하므로 "삼성전자" 처럼 띄어쓰기 없는 한글 제목도 부분 문자열로 검색됩니다.
+    인덱스는 external content 테이블이며 INSERT/DELETE/UPDATE 트리거로 원본과 동기화됩니다.
+
+    주의: 트리거는 원본 테이블에 걸리므로 이 DB 에 쓰는 모든 프로세스(수집기 포함)의 SQLite 도
+    FTS5 + trigram(3.34 이상)을 지원해야 합니다. 지원하지 않는 writer 는 INSERT 가 "no such module" 로 실패하므로
+    그런 writer 가 있으면 build 하지 말고(이미 만들었으면 drop) LIKE 검색을 사용합니다. (인덱스가 없으면 자동으로 LIKE)
+    """
+
+    def __init__(self, db_path):
+        self.conn = connect_writable(db_path)
+
+    def close_connection(self):
+        self.conn.close()
+
+    def exists(self):
+        row = self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)).fetchone()
+        return row is not None
+
+    def build(self, rebuild=False):
+        """
+        FTS 테이블과 동기화 트리거를 만들고 기존 데이터를 색인 (이미 있으면 rebuild=True 일 때만 재색인)
+        :return: 이 SQLite 가 FTS5 trigram 을 지원하지 않으면 트리거를 만들지 않고 False (검색은 LIKE 로 동작)
+        """
+        if not supports_fts_trigram(self.conn):
+            print(f"[FTS5] SQLite {sqlite3.sqlite_version} 가 FTS5 trigram 을 지원하지 않아 검색 인덱스를 만들지 않습니다. (LIKE 검색)")
+            return False
+        columns = ", ".join(FTS_COLUMNS)
+        new_values = ", ".join(f"new.{column}" for column in FTS_COLUMNS)
+        old_values = ", ".join(f"old.{column}" for column in FTS_COLUMNS)
+        existed = self.exists()
+
+        with self.conn:
+            self.conn.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+                    {columns},
+                    content='data_main_daily_send',
+                    content_rowid='id',
+                    tokenize='trigram'
+                )
+            """)
+            self.conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON data_main_daily_send BEGIN
+                    INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});
+                END
+            """)
+            self.conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON data_main_daily_send BEGIN
+                    INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                END
+            """)
+            # TELEGRAM_URL 등 색인 대상이 아닌 컬럼 갱신에는 반응하지 않도록 UPDATE OF 로 한정
+            self.conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {columns} ON data_main_daily_send BEGIN
+                    INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                    INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});
+                END
+            """)
+            if rebuild or not existed:
+                self.conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+                self.conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        return True
+
+    def drop(self):
+        with self.conn:
+            for suffix in ("ai", "ad", "au"):
+                self.conn.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+            self.conn.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def benchmark(db_path, keywords, repeat=5, limit=30):
+    """LIKE 전체 스캔 경로와 FTS5 경로의 검색 시간을 비교 출력"""
+    conn = connect_writable(db_path)
+    like_query = """
+        SELECT id, ARTICLE_TITLE, TELEGRAM_URL, WRITER, SAVE_TIME, FIRM_NM
+        FROM data_main_daily_send
+        WHERE ARTICLE_TITLE LIKE ?
+        ORDER BY id DESC
+    """
+    fts_query = f"""
+        SELECT d.id, d.ARTICLE_TITLE, d.TELEGRAM_URL, d.WRITER, d.SAVE_TIME, d.FIRM_NM
+        FROM data_main_daily_send d
+        WHERE d.id IN (
+            SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ? ORDER BY rowid DESC LIMIT ?
+        )
+        ORDER BY d.id DESC
+    """
+
+    def measure(query, params):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            rows = conn.execute(query, params).fetchall()
+        return (time.perf_counter() - started) / repeat * 1000, len(rows)
+
+    print(f"{'keyword':<16}{'LIKE(ms)':>12}{'rows':>8}{'FTS5(ms)':>12}{'rows':>8}{'speedup':>10}")
+    for keyword in keywords:
+        like_ms, like_rows = measure(like_query, (f"%{keyword}%",))
+        fts_ms, fts_rows = measure(fts_query, (fts_match_expression(keyword), limit))
+        print(f"{keyword:<16}{like_ms:>12.2f}{like_rows:>8}{fts_ms:>12.2f}{fts_rows:>8}{like_ms / fts_ms:>9.1f}x")
+    conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite FTS5 검색 인덱스 관리")
+    parser.add_argument("command", choices=["build", "rebuild", "drop", "bench"])
+    parser.add_argument("keywords", nargs="*", default=["삼성전자", "반도체", "SK하이닉스"])
+    parser.add_argument("--db", default=os.path.expanduser(os.getenv('SQLITE_PATH', '')))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        benchmark(args.db, args.keywords, repeat=args.repeat)
+    else:
+        index = SQLiteSearchIndex(args.db)
+        started = time.perf_counter()
+        if args.command == "drop":
+            index.drop()
+            print(f"[FTS5] {args.command} 완료 ({time.perf_counter() - started:.2f}초)")
+        elif index.build(rebuild=args.command == "rebuild"):
+            print(f"[FTS5] {args.command} 완료 ({time.perf_counter() - started:.2f}초)")
+        index.close_connection()
@@ -0,0 +1,100 @@
+import threading
+import time
+
+
+class Overloaded(Exception):
+    """동시 실행 한도와 대기열이 모두 차서 요청을 받지 않음 (503 + Retry-After 로 응답)"""
+
+
+class SingleFlight:
+    """
+    같은 키의 작업이 이미 실행 중이면 새로 실행하지 않고 그 결과를 함께 받습니다. (워커별 1개)
+
+    먼저 온 요청(리더)만 func 를 실행하고, 실행 중에 들어온 같은 키의 요청은 리더가 끝날 때까지 기다렸다가
+    같은 결과(또는 같은 예외)를 받습니다. 결과를 보관하지는 않으므로 끝난 뒤에 온 요청은 다시 실행합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call
+
+    def do(self, key, func):
+        """:return: (결과, 다른 요청의 실행 결과를 공유했는지)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ConcurrencyLimiter:
+    """
+    DB 작업의 동시 실행 수를 max_concurrent 로 제한하고, 초과분은 max_queue 개까지만 짧게 기다리게 합니다.
+
+    - 대기열이 가득 차면 기다리지 않고 즉시 Overloaded (DB 가 느려져도 gunicorn 스레드가 줄줄이 묶이지 않음)
+    - 대기가 queue_timeout 초를 넘어도 Overloaded
+    """
+
+    def __init__(self, max_concurrent=4, max_queue=8, queue_timeout=2.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+
+    def acquire(self):
+        """실행 자리를 받으면 대기 시간(초) 반환, 못 받으면 Overloaded"""
+        started = time.monotonic()
+        with self._cond:
+            if self._active < self.max_concurrent and not self._waiting:
+                self._active += 1
+                return 0.0
+            if self._waiting >= self.max_queue:
+                raise Overloaded("queue full")
+            self._waiting += 1
+            try:
+                if not self._cond.wait_for(lambda: self._active < self.max_concurrent, timeout=self.queue_timeout):
+                    raise Overloaded("queue timeout")
+                self._active += 1
+            finally:
+                self._waiting -= 1
+        return time.monotonic() - started
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return {"active": self._active, "waiting": self._waiting, "max": self.max_concurrent, "queue": self.max_queue}
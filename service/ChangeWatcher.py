@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import threading
+
+
+class ChangeWatcher:
+    """
+    SQLite 파일 변경을 감지해 백그라운드 스레드에서 캐시 갱신을 실행합니다.
+
+    - 버전 확인은 DB/WAL 파일의 stat 과 PRAGMA data_version 만 사용하므로 쿼리 비용이 없습니다.
+    - 갱신은 한 번에 하나만 실행됩니다(single-flight). 요청 스레드에서는 절대 실행되지 않습니다.
+    - 요청은 갱신을 기다리지 않고 마지막으로 게시된 캐시를 그대로 읽습니다.
+    """
+
+    def __init__(self, db_path, on_change, interval=5.0):
+        self.db_path = db_path
+        self.on_change = on_change
+        self.interval = interval
+        self._conn = None
+        self._version = None
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+
+    def _file_signature(self):
+        """DB 본 파일과 WAL 파일의 (mtime, size)"""
+        signature = []
+        for path in (self.db_path, self.db_path + '-wal'):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _data_version(self):
+        """다른 커넥션이 커밋할 때마다 바뀌는 PRAGMA data_version 값"""
+        try:
+            if self._conn is None:
+                self._conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            return None
+
+    def current_version(self):
+        return self._file_signature(), self._data_version()
+
+    def refresh(self):
+        """갱신 콜백 실행. 이미 다른 갱신이 진행 중이면 건너뛰고 False 반환"""
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            self.on_change()
+            return True
+        except Exception as e:
+            print(f"[ChangeWatcher] 캐시 갱신 실패: {e}")
+            return False
+        finally:
+            self._refresh_lock.release()
+
+    def trigger(self):
+        """다음 확인 주기를 기다리지 않고 갱신을 요청 (요청 스레드에서 호출해도 즉시 반환)"""
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            version = self.current_version()
+            if version != self._version or self._wakeup.is_set():
+                self._wakeup.clear()
+                # 갱신 전에 읽은 버전을 기록 → 갱신 도중 들어온 변경은 다음 주기에 다시 반영
+                if self.refresh():
+                    self._version = version
+            self._wakeup.wait(self.interval)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="cache-change-watcher", daemon=True)
+        self._thread.start()
+        print(f"[ChangeWatcher] 변경 감시 시작 (주기 {self.interval}초): {self.db_path}")
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
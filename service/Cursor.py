@@ -0,0 +1,22 @@
+import base64
+import json
+
+
+def encode_cursor(last_id):
+    """다음 페이지 조회용 불투명 커서 토큰 생성"""
+    payload = json.dumps({"id": last_id}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b'=').decode()
+
+
+def decode_cursor(token):
+    """커서 토큰 → 마지막 id. 잘못된 토큰이면 ValueError"""
+    if not token:
+        return 0
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"잘못된 커서입니다: {token}") from e
+    if not isinstance(last_id, int) or last_id < 0:
+        raise ValueError(f"잘못된 커서입니다: {token}")
+    return last_id
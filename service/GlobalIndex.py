@@ -0,0 +1,106 @@
+import sys
+import threading
+from bisect import bisect_left
+from service.ReportTransform import Report, make_report
+
+# manifest 에 게시하는 글로벌 레포트 id 인덱스 이름
+GLOBAL_INDEX_NAME = "global_index"
+
+
+def build_index_snapshot(rows, size):
+    """
+    리더가 게시할 글로벌 레포트 인덱스 데이터.
+    :param rows: fetch_global_articles_by_id(0, size) 결과 (id 내림차순 최근 size 건)
+    :return: {"complete": 글로벌 레포트 전체가 들어 있는지, "reports": [항목]}
+    """
+    reports = []
+    for report in map(make_report, rows):
+        item = report.to_dict()
+        item["firm"] = report.firm
+        item["save_date"] = report.save_date
+        reports.append(item)
+    return {"complete": len(rows) < size, "reports": reports}
+
+
+class GlobalReportIndex:
+    """
+    게시된 글로벌 레포트 인덱스 (id 오름차순 배열 + bisect 로 keyset 페이지 조회).
+
+    인덱스에는 가장 최근 글로벌 레포트 size 건이 빠짐없이 들어 있으므로, 요청한 페이지가 인덱스의 가장 작은 id
+    아래로 내려가지 않으면 DB 결과(id < last_id ORDER BY id DESC LIMIT n)와 같습니다. 내려가면 None (DB 조회)
+    """
+
+    def __init__(self, snapshot):
+        reports = []
+        for item in reversed(snapshot["reports"]):
+            reports.append(Report(
+                id=item["id"], title=item["title"], link=item["link"], writer=sys.intern(item["writer"]),
+                firm=sys.intern(item["firm"]), reg_dt="", save_date=sys.intern(item["save_date"]),
+                send_yn="Y", mkt_tp=None,
+            ))
+        self.reports = reports
+        self.ids = [report.id for report in reports]
+        self.complete = snapshot["complete"]
+
+    def page(self, last_id, limit):
+        """last_id 보다 작은 id 중 큰 순서로 limit 건 (last_id 가 0 이면 최신부터). 인덱스 밖이면 None"""
+        end = bisect_left(self.ids, last_id) if last_id else len(self.ids)
+        start = end - limit
+        if start < 0:
+            if not self.complete:
+                return None
+            start = 0
+        return self.reports[start:end][::-1]
+
+
+class GlobalIndexReader:
+    """
+    리더가 게시한 글로벌 인덱스를 각 워커가 메모리에 올려 사용합니다.
+
+    manifest 의 인덱스 해시가 바뀔 때만 다시 읽고, 무한 스크롤 첫 pages 페이지(last_id=0 → 이전 페이지의 마지막 id ...)
+    는 응답 본문을 미리 직렬화해 둡니다.
+    """
+
+    def __init__(self, manifest, render, page_size=10, pages=3):
+        self.manifest = manifest
+        self.render = render
+        self.page_size = page_size
+        self.pages = pages
+        self._hash = None
+        self._state = (None, {})  # (인덱스, {last_id: 미리 직렬화한 본문})
+        self._lock = threading.Lock()
+
+    def _load(self):
+        entry = self.manifest.current().get(GLOBAL_INDEX_NAME)
+        digest = entry.get("hash") if entry else None
+        if digest == self._hash:
+            return
+        with self._lock:
+            if digest == self._hash:
+                return
+            snapshot = self.manifest.load(GLOBAL_INDEX_NAME) if entry else None
+            index = GlobalReportIndex(snapshot) if snapshot is not None else None
+            payloads = {}
+            last_id = 0
+            for _ in range(self.pages if index is not None else 0):
+                reports = index.page(last_id, self.page_size)
+                if not reports:
+                    break
+                payloads[last_id] = self.render(reports)
+                last_id = reports[-1].id
+            # 읽는 쪽은 잠금 없이 참조하므로 인덱스/본문을 한 튜플로 만들어 한 번에 교체
+            self._state = (index, payloads)
+            self._hash = digest
+
+    def page(self, last_id):
+        """
+        (미리 직렬화한 본문 또는 None, 레포트 목록 또는 None).
+        둘 다 None 이면 인덱스가 없거나 인덱스 밖이므로 DB 에서 조회
+        """
+        self._load()
+        # 요청 하나는 같은 버전의 인덱스/본문만 보도록 한 번만 읽음
+        index, payloads = self._state
+        payload = payloads.get(last_id)
+        if payload is not None:
+            return payload, None
+        return None, index.page(last_id, self.page_size) if index is not None else None
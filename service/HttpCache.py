@@ -0,0 +1,58 @@
+import hashlib
+from datetime import timezone
+from flask import request, make_response
+
+# 엔드포인트별 Cache-Control 정책 (없으면 저장 금지)
+NO_STORE = "no-cache, no-store, must-revalidate"
+REVALIDATE = "no-cache"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def version_etag(*parts):
+    """스냅샷 버전 등 응답 내용을 결정하는 값들로 ETag 생성"""
+    return hashlib.sha1("|".join(str(part) for part in parts).encode('utf-8')).hexdigest()[:20]
+
+
+def _http_last_modified(last_modified):
+    """DB 의 naive(로컬) 시각 → 초 단위 UTC aware datetime"""
+    if last_modified is None:
+        return None
+    return last_modified.replace(microsecond=0).astimezone(timezone.utc)
+
+
+def _matching_etag(etag):
+    """If-None-Match 중 현재 ETag 와 같은 값을 반환 (Flask-Compress 가 붙인 ':gzip' 등 접미사 무시)"""
+    for tag in request.if_none_match.as_set():
+        if tag == "*" or tag.split(":", 1)[0] == etag:
+            return tag
+    return None
+
+
+def not_modified(etag, last_modified=None, cache_control=REVALIDATE):
+    """클라이언트 캐시가 최신이면 본문을 만들지 않고 304 응답을, 아니면 None 을 반환"""
+    if request.if_none_match:
+        matched = _matching_etag(etag)
+        if matched is None:
+            return None
+    else:
+        modified = _http_last_modified(last_modified)
+        if modified is None or request.if_modified_since is None or modified > request.if_modified_since:
+            return None
+        matched = etag
+
+    response = make_response("", 304)
+    response.set_etag(matched)
+    response.headers["Cache-Control"] = cache_control
+    if last_modified is not None:
+        response.last_modified = _http_last_modified(last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified=None, cache_control=REVALIDATE):
+    """200 응답에 ETag / Last-Modified / Cache-Control 설정"""
+    response = make_response(response)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _http_last_modified(last_modified)
+    response.headers["Cache-Control"] = cache_control
+    return response
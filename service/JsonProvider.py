@@ -0,0 +1,106 @@
+import json
+from flask.json.provider import DefaultJSONProvider
+from service.ReportTransform import Report, report_json_default
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 표준 json 으로 같은 출력을 만듦
+    orjson = None
+
+# 스트리밍 직렬화 시 파일에 한 번에 넘기는 최소 크기
+CHUNK_SIZE = 256 * 1024
+
+if orjson is not None:
+    # datetime/dataclass 는 orjson 기본 변환 대신 default 로 넘겨 표준 json 경로와 같은 결과를 내도록 함
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def dumps_bytes(data, default=report_json_default, sort_keys=False):
+    """
+    JSON 을 UTF-8 bytes 로 바로 직렬화 (str 을 거쳐 encode 하지 않음).
+    orjson 이 있으면 orjson, 없으면 json.dumps(ensure_ascii=False, 공백 없는 구분자) 와 같은 바이트를 만듭니다.
+    """
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(data, default=default, option=option)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=default,
+                      sort_keys=sort_keys).encode('utf-8')
+
+
+def loads_bytes(payload):
+    """JSON bytes/str → 객체 (orjson 이 있으면 orjson)"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def iter_json_chunks(data, chunk_size=CHUNK_SIZE):
+    """
+    최상위 dict/list 를 항목 단위로 직렬화해 chunk_size 이상씩 bytes 로 내보냄.
+    이어 붙이면 dumps_bytes(data) 와 같으며, 스냅샷 전체 문자열을 한 번에 메모리에 만들지 않습니다.
+    (스냅샷은 {일자: {증권사: [레포트]}} 이므로 한 번에 하루치만 직렬화)
+    """
+    if isinstance(data, dict):
+        opening, closing = b"{", b"}"
+        items = (dumps_bytes(key if isinstance(key, str) else str(key)) + b":" + dumps_bytes(value)
+                 for key, value in data.items())
+    elif isinstance(data, list):
+        opening, closing = b"[", b"]"
+        items = map(dumps_bytes, data)
+    else:
+        yield dumps_bytes(data)
+        return
+
+    buffer = bytearray(opening)
+    for index, item in enumerate(items):
+        if index:
+            buffer += b","
+        buffer += item
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += closing
+    yield bytes(buffer)
+
+
+def _response_default(obj):
+    """Flask 응답용 default: Report 는 JSON 필드만, 나머지는 Flask 기본 변환 (http date, UUID, dataclass 등)"""
+    if isinstance(obj, Report):
+        return obj.to_dict()
+    return DefaultJSONProvider.default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    jsonify / request.get_json 에 쓰이는 Flask JSON provider.
+
+    orjson 이 있으면 응답 본문을 bytes 로 바로 만들어 str → encode 과정을 건너뜁니다.
+    키 정렬(sort_keys)과 debug 모드 들여쓰기는 기본 provider 와 같고, 한글은 \\uXXXX 로 바꾸지 않고 UTF-8 그대로 내보냅니다.
+    orjson 이 없거나 json.dumps 전용 인자가 넘어오면 기본 provider 로 처리합니다.
+    """
+
+    ensure_ascii = False
+    default = staticmethod(_response_default)
+
+    def _dumps_bytes(self, obj, indent=False):
+        option = _ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._dumps_bytes(obj, indent) + b"\n", mimetype=self.mimetype)
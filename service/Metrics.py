@@ -0,0 +1,131 @@
+"""
+Prometheus 메트릭 정의와 /metrics 출력.
+
+gunicorn 워커가 여러 개일 때는 PROMETHEUS_MULTIPROC_DIR 을 지정하면 (gunicorn.conf.py 가 시작 시 비우고
+종료된 워커를 정리) 워커별 값이 파일로 기록되고 /metrics 요청 시 모든 워커 값을 합산해 출력합니다.
+지정하지 않으면 프로세스 내 기본 레지스트리를 그대로 출력합니다.
+"""
+import functools
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess,
+)
+
+# 요청/쿼리 지연용 버킷 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# 스냅샷 JSON 크기용 버킷 (바이트)
+SIZE_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024, 64 * 1024 * 1024)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "라우트별 응답 시간",
+    ["endpoint", "method", "status"], buckets=LATENCY_BUCKETS,
+)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "DB 매니저 메서드별 쿼리 시간",
+    ["backend", "query"], buckets=LATENCY_BUCKETS,
+)
+QUERY_ERRORS = Counter("db_query_errors_total", "DB 매니저 메서드별 쿼리 오류 수", ["backend", "query"])
+CONNECTIONS_OPENED = Counter("db_connections_opened_total", "새로 연 DB 커넥션 수", ["backend"])
+CONNECTIONS_REUSED = Counter("db_connections_reused_total", "재사용한 DB 커넥션 수", ["backend"])
+CONNECTION_ACQUIRE_DURATION = Histogram(
+    "db_connection_acquire_seconds", "커넥션 풀에서 커넥션을 얻기까지 걸린 시간 (대기 + 새 세션 생성)",
+    ["backend"], buckets=LATENCY_BUCKETS,
+)
+CONNECTION_RECONNECTS = Counter("db_connection_reconnects_total", "끊긴 커넥션을 버리고 다시 연결한 횟수", ["backend"])
+
+CACHE_REQUESTS = Counter(
+    "report_cache_requests_total", "레포트/검색 캐시 조회 결과 (hit / miss / not_modified)",
+    ["cache", "result"],
+)
+SEARCH_ADMISSIONS = Counter(
+    "search_admissions_total", "검색 DB 조회 입장 결과 (executed / coalesced / shed)", ["result"],
+)
+SEARCH_QUEUE_WAIT = Histogram(
+    "search_queue_wait_seconds", "검색 DB 조회가 동시 실행 자리를 기다린 시간", buckets=LATENCY_BUCKETS,
+)
+CACHE_REFRESHES = Counter(
+    "report_cache_refreshes_total", "레포트 캐시 갱신 결과 (changed / unchanged / error)", ["result"],
+)
+CACHE_REFRESH_DURATION = Histogram(
+    "report_cache_refresh_duration_seconds", "레포트 캐시 갱신 소요 시간", buckets=LATENCY_BUCKETS,
+)
+CACHE_UPDATES = Counter("report_cache_updates_total", "레포트 뷰별 내용 변경 횟수", ["cache"])
+CACHE_LAST_REFRESH = Gauge(
+    "report_cache_last_refresh_timestamp_seconds", "마지막 레포트 캐시 갱신 시각 (unix time)",
+    multiprocess_mode="max",
+)
+REFRESH_LEADER = Gauge(
+    "report_refresh_leader", "캐시 갱신 리더 워커 수 (항상 1 이어야 함)", multiprocess_mode="livesum",
+)
+
+STARTUP_DURATION = Gauge(
+    "app_startup_duration_seconds", "워커가 요청을 받을 수 있을 때까지 걸린 시간 (warm / cold / follower)", ["mode"],
+    multiprocess_mode="liveall",
+)
+
+REPLICA_ROWS = Counter("replica_rows_total", "Oracle 복제본에 반영한 행 수 (inserted / updated)", ["kind"])
+REPLICA_SOURCE_LAG = Gauge(
+    "replica_source_lag_seconds", "마지막 동기화 시점의 Oracle 대비 복제본 SAVE_TIME 지연", multiprocess_mode="livemax",
+)
+REPLICA_LAST_SYNC = Gauge(
+    "replica_last_sync_timestamp_seconds", "마지막 복제본 동기화 성공 시각 (unix time)", multiprocess_mode="max",
+)
+
+SNAPSHOT_WRITE_DURATION = Histogram(
+    "snapshot_write_duration_seconds", "JSON 스냅샷 기록 시간 (직렬화 + 압축 + 원자적 쓰기)",
+    ["name"], buckets=LATENCY_BUCKETS,
+)
+SNAPSHOT_WRITE_BYTES = Histogram(
+    "snapshot_write_bytes", "JSON 스냅샷 크기 (압축 전)", ["name"], buckets=SIZE_BUCKETS,
+)
+
+SCHEDULER_JOB_LAG = Histogram(
+    "scheduler_job_lag_seconds", "APScheduler 예약 시각 대비 실행 지연", ["job"], buckets=LATENCY_BUCKETS,
+)
+SCHEDULER_JOB_EVENTS = Counter(
+    "scheduler_job_events_total", "APScheduler 작업 결과 (executed / error / missed)", ["job", "event"],
+)
+
+
+def observe_query(backend):
+    """DB 매니저 메서드 데코레이터: 메서드 이름별 쿼리 시간과 오류 수를 기록"""
+    def decorator(func):
+        duration = QUERY_DURATION.labels(backend, func.__name__)
+        errors = QUERY_ERRORS.labels(backend, func.__name__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                duration.observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def observe_scheduler_event(event):
+    """APScheduler 리스너 (EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED)"""
+    from apscheduler.events import EVENT_JOB_MISSED
+
+    if event.code == EVENT_JOB_MISSED:
+        SCHEDULER_JOB_EVENTS.labels(event.job_id, "missed").inc()
+        return
+    SCHEDULER_JOB_EVENTS.labels(event.job_id, "error" if event.exception else "executed").inc()
+    # 예약 시각과 리스너 호출 시각의 차이 (trigger 작업은 즉시 끝나므로 시작 지연과 거의 같음)
+    lag = time.time() - event.scheduled_run_time.timestamp()
+    SCHEDULER_JOB_LAG.labels(event.job_id).observe(max(lag, 0.0))
+
+
+def render_metrics():
+    """/metrics 응답 본문과 Content-Type (멀티 프로세스 모드면 모든 워커 값을 합산)"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
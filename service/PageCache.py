@@ -0,0 +1,62 @@
+import gzip
+import hashlib
+import os
+import threading
+from flask import request, make_response
+from service.HttpCache import set_validators
+from service.Metrics import CACHE_REQUESTS
+
+try:
+    import brotli
+except ImportError:  # brotli 가 없으면 gzip 만 사용
+    brotli = None
+
+
+def static_asset_url(static_folder, filename):
+    """정적 파일 내용의 해시를 붙인 URL (시작 시 한 번 계산, 내용이 바뀌면 URL 도 바뀜)"""
+    with open(os.path.join(static_folder, filename), 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+    return f"/static/{filename}?v={digest}"
+
+
+class RenderedPageCache:
+    """
+    렌더링된 HTML 을 스냅샷 버전(ETag)별로 보관합니다.
+
+    ETag 가 바뀔 때만 다시 렌더링하고 gzip/br 압축본도 그때 한 번만 만듭니다.
+    이후 요청은 메모리 조회 + 미리 압축된 바이트 전송만 수행합니다.
+    """
+
+    def __init__(self):
+        self._pages = {}  # name -> (etag, {encoding: bytes})
+        self._lock = threading.Lock()
+
+    def _variants(self, name, etag, render):
+        entry = self._pages.get(name)
+        if entry is not None and entry[0] == etag:
+            CACHE_REQUESTS.labels(name, "hit").inc()
+            return entry[1]
+        CACHE_REQUESTS.labels(name, "miss").inc()
+
+        body = render().encode('utf-8')
+        variants = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, quality=9)
+        with self._lock:
+            self._pages[name] = (etag, variants)
+        return variants
+
+    def response(self, name, etag, last_modified, render):
+        """캐시된(없으면 렌더링한) 페이지를 클라이언트가 지원하는 인코딩으로 응답"""
+        variants = self._variants(name, etag, render)
+        encoding = request.accept_encodings.best_match([key for key in variants if key != "identity"])
+
+        response = make_response(variants[encoding or "identity"])
+        response.mimetype = "text/html"
+        response = set_validators(response, etag, last_modified)
+        response.vary.add("Accept-Encoding")
+        if encoding:
+            # Flask-Compress 와 같은 규칙으로 인코딩별 ETag 구분 ("etag:gzip")
+            response.headers["Content-Encoding"] = encoding
+            response.set_etag(f"{etag}:{encoding}")
+        return response
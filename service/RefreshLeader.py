@@ -0,0 +1,67 @@
+import fcntl
+import os
+import threading
+
+
+class RefreshLeader:
+    """
+    gunicorn 워커 중 하나만 캐시 갱신(스케줄러 + ChangeWatcher + 스냅샷 게시)을 맡도록 파일 잠금으로 선출합니다.
+
+    - flock 은 프로세스가 죽으면 커널이 풀어 주므로, 리더 워커가 재시작되면 다른 워커가 interval 안에 이어받습니다.
+    - 잠금은 import 이후(워커 프로세스 안)에서만 잡아야 합니다. gunicorn --preload 로 마스터에서 잡으면
+      fork 된 워커들이 같은 잠금을 공유하게 되므로 사용하지 않습니다.
+    """
+
+    def __init__(self, lock_path, interval=5.0):
+        self.lock_path = lock_path
+        self.interval = interval
+        self._fd = None
+        self._stopped = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def is_leader(self):
+        return self._fd is not None
+
+    def try_acquire(self):
+        """잠금을 잡으면 True (이미 리더면 그대로 True)"""
+        if self._fd is not None:
+            return True
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        # 디버깅용: 현재 리더 pid 기록
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+    def _run(self, on_elected):
+        while not self._stopped.is_set():
+            if self.try_acquire():
+                print(f"[RefreshLeader] pid {os.getpid()} 가 캐시 갱신 리더가 되었습니다.")
+                on_elected()
+                return
+            self._stopped.wait(self.interval)
+
+    def start(self, on_elected):
+        """리더가 될 때까지 백그라운드에서 재시도하고, 선출되면 on_elected() 를 한 번 호출 (여러 요청 스레드에서 불려도 한 번만 시작)"""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, args=(on_elected,), name="RefreshLeader", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self.release()
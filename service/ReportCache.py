@@ -0,0 +1,280 @@
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from operator import attrgetter
+from service.ReportTransform import Report, make_report, save_time_date, reg_dt_date
+
+# 게시 스냅샷(JSON)의 구조 버전. Report.to_dict 필드나 date → firm → [레포트] 구조가 바뀌면 올려서
+# 이전 버전 스냅샷으로 웜 스타트하지 않도록 함
+SNAPSHOT_FORMAT_VERSION = 1
+
+# 그룹 일자 키 → 스냅샷에서 복원할 때 일자 값을 넣을 Report 필드
+DATE_KEY_FIELDS = {save_time_date: "save_date", reg_dt_date: "reg_dt"}
+
+
+class IncrementalGroupedCache:
+    """
+    date → firm → [Report] 형태의 그룹 뷰 하나를 증분 갱신합니다.
+
+    - ReportSnapshotBuilder 가 조회한 새 행/재조회 행을 받아 해당 date/firm 버킷에만 병합합니다.
+    - 링크(TELEGRAM_URL)가 아직 비어 있는 행은 pending 으로 기억해 다음 갱신 때 id 로만 다시 조회합니다.
+      (발송 시 링크와 MAIN_CH_SEND_YN 이 함께 갱신되므로 노출 조건 변화도 여기서 반영됩니다.)
+    - REG_DT 윈도우가 하루 밀리면 범위를 벗어난 일자의 행을 제거합니다.
+    - 증분 조회로는 알 수 없는 변경(이미 링크가 있는 행의 수정, 행 삭제)은 주기적인 전체 재조정(present)으로 반영합니다.
+    - 버킷/일자/증권사 순서는 전체 재조회(ORDER BY id DESC)와 동일하게 유지합니다.
+    """
+
+    def __init__(self, date_key, days_before, days_after=2, row_filter=None):
+        self.date_key = date_key
+        self.days_before = days_before
+        self.days_after = days_after
+        self.row_filter = row_filter
+        self.reset()
+
+    def reset(self):
+        self._entries = {}  # id -> Report
+        self._pending = {}  # id -> REG_DT (링크 미반영)
+        self._evicted_before = None
+        self.current_window = None
+        self.data = None
+        self.changed_dates = None  # 마지막 _publish 에서 내용이 바뀐 일자 (None 이면 전체)
+        self.restored = False  # 게시 스냅샷에서 복원한 상태인지 (윈도우가 바뀌면 전체 재조회)
+
+    def restore(self, snapshot, window, pending, reports):
+        """
+        게시된 스냅샷 JSON({일자: {증권사: [항목]}})으로 캐시 상태 복원 (웜 스타트).
+        스냅샷에 없는 필드(다른 기준 일자, 구분값)는 비어 있으므로 윈도우가 바뀌기 전까지만 증분 갱신합니다.
+        :param pending: {id: REG_DT} 링크를 기다리는 행
+        :param reports: 뷰 사이에 공유하는 {id: Report} (같은 행은 한 객체로 복원)
+        """
+        self.reset()
+        field = DATE_KEY_FIELDS[self.date_key]
+        data = {}
+        for date, firms in snapshot.items():
+            date = sys.intern(date)
+            grouped = data[date] = {}
+            for firm, items in firms.items():
+                firm = sys.intern(firm)
+                bucket = grouped[firm] = []
+                for item in items:
+                    report = reports.get(item["id"])
+                    if report is None:
+                        report = reports[item["id"]] = Report(
+                            id=item["id"], title=item["title"], link=item["link"], writer=sys.intern(item["writer"]),
+                            firm=firm, reg_dt="", save_date="", send_yn="", mkt_tp=None,
+                        )
+                    setattr(report, field, date)
+                    self._entries[report.id] = report
+                    bucket.append(report)
+        self.data = data
+        self._pending = dict(pending)
+        self.current_window = tuple(window)
+        self._evicted_before = self.current_window[0]
+        self.restored = True
+
+    def window(self, date_str=None):
+        query_date = datetime.strptime(date_str, '%Y%m%d') if date_str else datetime.now()
+        from_dt = (query_date - timedelta(days=self.days_before)).strftime('%Y%m%d')
+        to_dt = (query_date + timedelta(days=self.days_after)).strftime('%Y%m%d')
+        return from_dt, to_dt
+
+    def needs_refresh(self, date_str=None):
+        """DB 최종 수정 시각이 같아도 갱신이 필요한지 (윈도우 이동 또는 pending 행 존재)"""
+        return self.current_window != self.window(date_str) or bool(self._pending)
+
+    def pending_ids(self):
+        return self._pending.keys()
+
+    def apply(self, reports, date_str=None, present=None):
+        """
+        조회된 행(Report)을 병합하고 윈도우 밖 행을 제거. 게시 데이터가 바뀌었으면 True
+        :param present: 윈도우 전체를 다시 조회한 경우 조회된 id 집합. 여기에 없는 캐시 행(삭제된 행)도 제거
+        """
+        self.current_window = self.window(date_str)
+        removed, affected = self._evict(self.current_window[0])
+        added = self._merge(reports, removed, affected)
+        if present is not None:
+            self._drop_missing(present, removed, affected)
+            # 남은 행은 모두 DB 에서 다시 읽은 Report 로 교체됐으므로 더 이상 복원 상태가 아님
+            self.restored = False
+        if not affected and self.data is not None:
+            return False
+        self._publish(affected, removed, added)
+        return True
+
+    def _evict(self, from_dt):
+        """윈도우 밖으로 밀려난 REG_DT 일자의 행 제거 (윈도우 시작일이 바뀐 경우에만 전체 확인)"""
+        removed, affected = set(), set()
+        if self._evicted_before == from_dt:
+            return removed, affected
+        for row_id in [row_id for row_id, report in self._entries.items() if report.reg_dt < from_dt]:
+            report = self._entries.pop(row_id)
+            removed.add(row_id)
+            affected.add((self.date_key(report), report.firm))
+        self._pending = {row_id: reg_dt for row_id, reg_dt in self._pending.items() if reg_dt >= from_dt}
+        self._evicted_before = from_dt
+        return removed, affected
+
+    def _merge(self, reports, removed, affected):
+        """조회된 행을 엔트리/pending 에 반영하고 버킷별 추가 행을 반환"""
+        from_dt, to_dt = self.current_window
+        added = defaultdict(list)
+        for report in reports:
+            row_id = report.id
+            self._pending.pop(row_id, None)
+
+            in_window = from_dt <= report.reg_dt <= to_dt
+            visible = in_window and (self.row_filter is None or self.row_filter(report))
+
+            # 이미 캐시된 행이 다시 조회되면(링크 갱신 등) 바뀐 경우에만 기존 위치에서 제거 후 다시 추가
+            cached = self._entries.get(row_id)
+            if cached is not None:
+                if visible and cached == report:
+                    if not report.link:
+                        self._pending[row_id] = report.reg_dt
+                    continue
+                del self._entries[row_id]
+                removed.add(row_id)
+                affected.add((self.date_key(cached), cached.firm))
+
+            if not visible:
+                # 아직 발송 전(링크 없음)인 행만 노출 조건이 바뀔 수 있으므로 다시 확인
+                if in_window and not report.link:
+                    self._pending[row_id] = report.reg_dt
+                continue
+
+            self._entries[row_id] = report
+            if not report.link:
+                self._pending[row_id] = report.reg_dt
+            key = (self.date_key(report), report.firm)
+            added[key].append(report)
+            affected.add(key)
+        return added
+
+    def _drop_missing(self, present, removed, affected):
+        """전체 재조정에서 조회되지 않은 (DB 에서 삭제된) 캐시 행과 pending 행 제거"""
+        for row_id in [row_id for row_id in self._entries if row_id not in present]:
+            report = self._entries.pop(row_id)
+            removed.add(row_id)
+            affected.add((self.date_key(report), report.firm))
+        self._pending = {row_id: reg_dt for row_id, reg_dt in self._pending.items() if row_id in present}
+
+    def _publish(self, affected, removed, added):
+        """변경된 버킷만 새로 만들어 새 스냅샷으로 교체 (기존 스냅샷은 건드리지 않음)"""
+        # 새로 만든 스냅샷이면 모든 일자, 아니면 변경된 버킷의 일자만 (일자별 파티션 재기록 대상)
+        self.changed_dates = None if self.data is None else {date for date, _ in affected}
+        grouped = {date: dict(firms) for date, firms in (self.data or {}).items()}
+        for date, firm in affected:
+            firms = grouped.setdefault(date, {})
+            reports = [report for report in firms.get(firm, ()) if report.id not in removed]
+            reports.extend(added.get((date, firm), ()))
+            if reports:
+                reports.sort(key=attrgetter("id"), reverse=True)
+                firms[firm] = reports
+            else:
+                firms.pop(firm, None)
+
+        # 전체 재조회 시의 순서(id DESC 로 처음 등장한 순서) = 그룹별 최대 id 내림차순
+        for date in {date for date, _ in affected}:
+            firms = grouped[date]
+            if firms:
+                grouped[date] = dict(sorted(firms.items(), key=lambda item: item[1][0].id, reverse=True))
+            else:
+                del grouped[date]
+        self.data = dict(sorted(grouped.items(), key=lambda item: next(iter(item[1].values()))[0].id, reverse=True))
+
+
+class ReportSnapshotBuilder:
+    """
+    여러 그룹 뷰가 필요로 하는 가장 넓은 REG_DT 윈도우를 한 번만 조회해 모든 뷰를 함께 갱신합니다.
+
+    DB 조회(새 행 + pending 행 재조회)는 갱신 1회당 한 번씩이며, 뷰별 윈도우/필터/일자 기준은
+    각 IncrementalGroupedCache 가 메모리에서 적용합니다.
+    날짜가 바뀔 때, 웜 스타트 직후, reconcile_interval 초마다 한 번은 윈도우 전체를 다시 조회해
+    이미 링크가 있는 행의 수정과 삭제된 행을 반영합니다. (캐시는 초기화하지 않고 바뀐 버킷만 다시 게시)
+    """
+
+    def __init__(self, views, reconcile_interval=600.0):
+        self.views = views
+        self.reconcile_interval = reconcile_interval
+        self._max_id = 0
+        self._reconcile_at = 0.0  # time.monotonic() 기준 다음 전체 재조정 시각
+
+    def needs_refresh(self, date_str=None):
+        return (time.monotonic() >= self._reconcile_at
+                or any(view.needs_refresh(date_str) for view in self.views.values()))
+
+    def refresh(self, db, date_str=None):
+        """새로 추가/변경된 행을 한 번 조회해 모든 뷰에 반영. 바뀐 뷰 이름 목록 반환"""
+        windows = {name: view.window(date_str) for name, view in self.views.items()}
+        from_dt = min(window[0] for window in windows.values())
+        to_dt = max(window[1] for window in windows.values())
+
+        # 스냅샷에서 복원한 뷰는 REG_DT 등이 비어 있어 윈도우 밖 행을 가려낼 수 없으므로 윈도우가 바뀌면 다시 만듦
+        full_scan = any(
+            view.current_window is None or windows[name][0] < view.current_window[0]
+            or (view.restored and windows[name] != view.current_window)
+            for name, view in self.views.items()
+        )
+        # 윈도우가 밀렸거나(날짜 변경) 재조정 주기가 지났으면 초기화 없이 윈도우 전체를 다시 조회해 비교
+        reconcile = not full_scan and (
+            time.monotonic() >= self._reconcile_at
+            or any(windows[name] != view.current_window for name, view in self.views.items())
+        )
+        if full_scan:
+            for view in self.views.values():
+                view.reset()
+            self._max_id = 0
+            rows = db.fetch_articles_since(from_dt, to_dt)
+        elif reconcile:
+            rows = db.fetch_articles_since(from_dt, to_dt)
+        else:
+            # 윈도우 끝이 밀리며 새로 포함된 일자는 가장 앞선 이전 윈도우 끝 이후부터 조회
+            prev_to_dt = min(view.current_window[1] for view in self.views.values())
+            pending = set()
+            for view in self.views.values():
+                pending.update(view.pending_ids())
+            rows = db.fetch_articles_since(from_dt, to_dt, self._max_id, prev_to_dt)
+            rows += db.fetch_articles_by_ids(list(pending))
+
+        # 행 변환은 한 번만 하고 모든 뷰가 같은 Report 객체를 공유
+        reports = list(map(make_report, rows))
+        del rows
+        for report in reports:
+            self._max_id = max(self._max_id, report.id)
+        present = None
+        if full_scan or reconcile:
+            self._reconcile_at = time.monotonic() + self.reconcile_interval
+            if reconcile:
+                present = {report.id for report in reports}
+        return [name for name, view in self.views.items() if view.apply(reports, date_str, present)]
+
+    def state(self):
+        """스냅샷과 함께 게시해 웜 스타트 시 복원할 상태 (JSON 직렬화 가능)"""
+        pending = {}
+        for view in self.views.values():
+            pending.update(view._pending)
+        return {
+            "max_id": self._max_id,
+            "pending": {str(row_id): reg_dt for row_id, reg_dt in pending.items()},
+            "windows": {name: list(view.current_window) for name, view in self.views.items() if view.current_window},
+        }
+
+    def restore(self, snapshots, state, date_str=None):
+        """
+        게시된 스냅샷과 state() 로 모든 뷰 복원. 뷰 윈도우가 현재 날짜/설정과 다르면 복원하지 않고 False
+        :param snapshots: {뷰 이름: 스냅샷 JSON}
+        """
+        windows = state.get("windows", {})
+        if any(tuple(windows.get(name, ())) != view.window(date_str) or name not in snapshots
+               for name, view in self.views.items()):
+            return False
+        pending = {int(row_id): reg_dt for row_id, reg_dt in state.get("pending", {}).items()}
+        reports = {}
+        for name, view in self.views.items():
+            view.restore(snapshots[name], windows[name], pending, reports)
+        self._max_id = int(state.get("max_id", 0))
+        # 스냅샷 게시 이후 삭제/수정된 행이 다시 게시되지 않도록 첫 갱신은 전체 재조정
+        self._reconcile_at = 0.0
+        return True
@@ -0,0 +1,188 @@
+import itertools
+import threading
+import time
+from collections import deque
+from service.JsonProvider import dumps_bytes
+from service.ReportTransform import make_report
+
+
+def feed_item(report):
+    """SSE 로 보내는 레포트 한 건 (페이지가 일자/증권사 그룹을 찾을 수 있도록 그룹 키 포함)"""
+    return {
+        "id": report.id,
+        "title": report.title,
+        "link": report.link,
+        "writer": report.writer,
+        "firm": report.firm,
+        "save_date": report.save_date,
+        "reg_dt": report.reg_dt,
+    }
+
+
+def sse_event(event, data, event_id=None):
+    """text/event-stream 이벤트 한 개"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + dumps_bytes(data).decode('utf-8'))
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_retry(milliseconds):
+    """재접속 대기 시간만 알리는 이벤트 스트림 본문 (이 응답을 닫으면 브라우저가 milliseconds 후 다시 접속)"""
+    return f"retry: {milliseconds:.0f}\n\n"
+
+
+class ReportFeed:
+    """
+    새로 노출된 레포트(링크가 생긴 행)만 모아 SSE 구독자에게 전달합니다. (워커별 1개)
+
+    - 리더 워커가 게시한 스냅샷 버전(version_source)이 바뀔 때만 DB 를 조회합니다.
+      조회는 버전당 한 번: 마지막으로 본 id 이후의 행 + 링크를 기다리는(pending) 행 재조회
+    - 피드 시작 전부터 링크를 기다리던 행은 pending_source(리더가 게시한 대기 행 id)로 이어 받습니다.
+    - 최근 노출된 레포트를 max_events 개까지 보관하고, 구독자는 접속 이후 추가된 것만 받습니다.
+    - 재접속한 클라이언트(Last-Event-ID)가 놓친 행은 DB 에서 이어서 보내고, 너무 많으면 reset 이벤트로
+      스냅샷을 다시 받도록 합니다.
+    - 구독 하나가 gunicorn 스레드 하나를 차지하므로 동시 구독 수(max_streams)와 연결 시간(stream_timeout)을 제한합니다.
+    """
+
+    def __init__(self, version_source, db_factory, interval=1.0, max_events=1000, batch_limit=500,
+                 max_streams=8, stream_timeout=300, heartbeat=15, pending_source=None):
+        self.version_source = version_source
+        self.db_factory = db_factory
+        self.pending_source = pending_source
+        self.interval = interval
+        self.batch_limit = batch_limit
+        self.max_streams = max_streams
+        self.stream_timeout = stream_timeout
+        self.heartbeat = heartbeat
+        self._events = deque(maxlen=max_events)
+        self._appended = 0  # 지금까지 _events 에 추가된 총 건수 (구독자 위치 계산용)
+        self._cond = threading.Condition()
+        self._pending = set()  # 링크를 기다리는 행 id
+        self._version = None
+        self._max_id = None
+        self._floor = None  # 피드 시작 시점의 최대 id (이전 행은 DB 에서 이어 받기)
+        self._streams = 0
+        self._streams_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="ReportFeed", daemon=True)
+            self._thread.start()
+            # 첫 조회 기준점이 정해질 때까지 대기 (구독 시작 위치가 어긋나지 않도록)
+            self._cond.wait_for(lambda: self._floor is not None, timeout=self.interval * 5)
+
+    def _run(self):
+        while True:
+            try:
+                version = self.version_source()
+                if self._max_id is None or version != self._version:
+                    self._version = version
+                    self._collect()
+            except Exception as e:
+                print(f"[ReportFeed] 새 레포트 조회 실패: {e}")
+            time.sleep(self.interval)
+
+    def _collect(self):
+        db = self.db_factory()
+        try:
+            if self._max_id is None:
+                self._max_id = db.fetch_max_id()
+                if self.pending_source is not None:
+                    self._pending.update(row_id for row_id in self.pending_source() if row_id <= self._max_id)
+                with self._cond:
+                    self._floor = self._max_id
+                    self._cond.notify_all()
+                return
+            rows = db.fetch_articles_after(self._max_id, self.batch_limit)
+            while rows and len(rows) % self.batch_limit == 0:
+                more = db.fetch_articles_after(rows[-1].id, self.batch_limit)
+                if not more:
+                    break
+                rows += more
+            if self._pending:
+                rows += db.fetch_articles_by_ids(list(self._pending))
+        finally:
+            db.close_connection()
+
+        visible = []
+        for report in sorted(map(make_report, rows), key=lambda report: report.id):
+            self._max_id = max(self._max_id, report.id)
+            if report.link:
+                self._pending.discard(report.id)
+                visible.append(report)
+            else:
+                self._pending.add(report.id)
+        if visible:
+            with self._cond:
+                self._events.extend(visible)
+                self._appended += len(visible)
+                self._cond.notify_all()
+
+    def try_open(self):
+        """구독 자리를 확보하면 True (Response.call_on_close 에서 close() 호출)"""
+        with self._streams_lock:
+            if self._streams >= self.max_streams:
+                return False
+            self._streams += 1
+            return True
+
+    def close(self):
+        with self._streams_lock:
+            self._streams -= 1
+
+    def _catch_up(self, last_id, until_id):
+        """피드 시작 이전에 추가되어 클라이언트가 놓친 행 (너무 많으면 None)"""
+        db = self.db_factory()
+        try:
+            rows = db.fetch_articles_after(last_id, self.batch_limit + 1)
+        finally:
+            db.close_connection()
+        if len(rows) > self.batch_limit:
+            return None
+        return [make_report(row) for row in rows if row.id <= until_id and row.TELEGRAM_URL]
+
+    def stream(self, last_id):
+        """last_id 이후에 노출된 레포트를 reports 이벤트로 보내는 제너레이터"""
+        self.start()
+        with self._cond:
+            position = self._appended
+            initial = [report for report in self._events if report.id > last_id]
+            floor = self._floor
+
+        yield sse_retry(self.interval * 5 * 1000)
+        if last_id and floor is not None and last_id < floor:
+            missed = self._catch_up(last_id, floor)
+            if missed is None:
+                yield sse_event("reset", {})
+                return
+            initial = missed + initial
+
+        sent_id = last_id
+        if initial:
+            sent_id = max(sent_id, max(report.id for report in initial))
+            yield sse_event("reports", [feed_item(report) for report in initial], sent_id)
+
+        deadline = time.monotonic() + self.stream_timeout
+        while time.monotonic() < deadline:
+            # 잠금은 이벤트를 복사하는 동안만 잡고 소켓 쓰기(yield)는 잠금 밖에서 (느린 구독자가 피드 스레드/다른 구독자를 막지 않도록)
+            with self._cond:
+                self._cond.wait_for(lambda: self._appended > position, timeout=self.heartbeat)
+                start = self._appended - len(self._events)
+                overrun = position < start
+                new = [] if overrun else list(itertools.islice(self._events, position - start, None))
+                position = self._appended
+            if overrun:
+                # 보관 범위를 넘어설 만큼 밀림 → 스냅샷부터 다시
+                yield sse_event("reset", {})
+                return
+            if new:
+                sent_id = max(sent_id, max(report.id for report in new))
+                yield sse_event("reports", [feed_item(report) for report in new], sent_id)
+            else:
+                yield ": ping\n\n"
@@ -0,0 +1,99 @@
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime
+
+
+@dataclass(slots=True)
+class Report:
+    """
+    캐시/응답에 사용하는 레포트 한 건 (__slots__ 기반으로 dict 보다 작음).
+    행 하나당 한 번만 만들어 모든 그룹 뷰가 같은 객체를 공유합니다.
+    JSON 으로는 id/title/link/writer 만 내보내고 나머지는 버킷/필터 판단용으로만 사용합니다.
+    """
+    id: int
+    title: str
+    link: str
+    writer: str
+    firm: str
+    reg_dt: str
+    save_date: str
+    send_yn: str
+    mkt_tp: str
+
+    def to_dict(self):
+        return {"id": self.id, "title": self.title, "link": self.link, "writer": self.writer}
+
+
+def report_json_default(obj):
+    """json.dumps(default=...) 용: Report 를 JSON 객체로 변환"""
+    if isinstance(obj, Report):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def save_date_of(save_time):
+    """
+    SAVE_TIME → 'YYYY-MM-DD'
+    SQLite 는 ISO 문자열('2025-01-01T09:00:00.000000')이므로 앞 10자리만 잘라 쓰고 (strptime 불필요),
+    Oracle 은 datetime 이므로 date() 로 변환합니다.
+    """
+    if isinstance(save_time, str):
+        return sys.intern(save_time.strip()[:10])
+    if isinstance(save_time, datetime):
+        return sys.intern(save_time.date().isoformat())
+    if isinstance(save_time, date):
+        return sys.intern(save_time.isoformat())
+    return ""
+
+
+def make_report(row):
+    """ReportRow → Report (반복되는 일자/증권사/작성자/구분값 문자열은 intern 으로 공유)"""
+    return Report(
+        id=row.id,
+        title=(row.ARTICLE_TITLE or "").strip(),
+        link=(row.TELEGRAM_URL or "").strip(),
+        writer=sys.intern((row.WRITER or "").strip()),
+        firm=sys.intern((row.FIRM_NM or "").strip()),
+        reg_dt=sys.intern((row.REG_DT or "").strip()),
+        save_date=save_date_of(row.SAVE_TIME),
+        send_yn=sys.intern(row.MAIN_CH_SEND_YN or ""),
+        mkt_tp=sys.intern(row.MKT_TP) if row.MKT_TP is not None else None,
+    )
+
+
+def save_time_date(report):
+    """SAVE_TIME 기준 일자 (YYYY-MM-DD)"""
+    return report.save_date
+
+
+def reg_dt_date(report):
+    """REG_DT 기준 일자 (YYYYMMDD)"""
+    return report.reg_dt
+
+
+def is_global_report(report):
+    """글로벌 레포트 조건 (MAIN_CH_SEND_YN = 'Y' AND MKT_TP <> 'KR')"""
+    return report.send_yn == 'Y' and report.mkt_tp not in (None, 'KR')
+
+
+def group_reports(rows, date_key=save_time_date, item=Report.to_dict):
+    """
+    조회 순서를 유지하며 date → firm → [item] 으로 묶습니다. (검색/글로벌 페이지 응답용)
+    :param rows: ReportRow 목록
+    :param item: 각 레포트를 응답 항목으로 바꾸는 함수 (기본: JSON dict)
+    """
+    return group_report_objects(map(make_report, rows), date_key, item)
+
+
+def group_report_objects(reports, date_key=save_time_date, item=Report.to_dict):
+    """group_reports 와 같지만 이미 만들어진 Report 를 묶음 (메모리 인덱스 응답용)"""
+    grouped = {}
+    for report in reports:
+        firms = grouped.get(date_key(report))
+        if firms is None:
+            firms = grouped[date_key(report)] = {}
+        reports_of_firm = firms.get(report.firm)
+        if reports_of_firm is None:
+            reports_of_firm = firms[report.firm] = []
+        reports_of_firm.append(item(report))
+    return grouped
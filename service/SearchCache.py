@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_keyword(keyword):
+    """앞뒤 공백 제거 + 연속 공백을 하나로 (캐시 키/DB 조회에 같은 값을 사용)"""
+    return " ".join(keyword.split())
+
+
+class SearchResultCache:
+    """
+    검색 결과용 LRU + TTL 캐시.
+
+    - 항목 수가 max_entries 를 넘으면 가장 오래 쓰지 않은 항목부터 제거합니다.
+    - ttl 초가 지난 항목은 조회 시 만료 처리합니다.
+    - DB 버전(MAX(SAVE_TIME))이 바뀌면 invalidate() 로 전체를 비웁니다.
+      조회 시작 후 무효화가 일어난 결과는 generation 비교로 저장하지 않습니다.
+    """
+
+    def __init__(self, max_entries=512, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.version = None
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+    def set(self, key, value, generation=None):
+        """generation 이 주어지면 그 사이 무효화가 없었을 때만 저장"""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, version):
+        """DB 버전이 바뀌었으면 캐시 전체를 비움"""
+        with self._lock:
+            if version == self.version:
+                return
+            self.version = version
+            self.generation += 1
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,413 @@
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+from service.JsonProvider import dumps_bytes, iter_json_chunks, loads_bytes
+from service.Metrics import SNAPSHOT_WRITE_BYTES, SNAPSHOT_WRITE_DURATION
+
+try:
+    import brotli
+except ImportError:  # brotli 가 없으면 .br 사이드카만 생략
+    brotli = None
+
+MANIFEST_FILENAME = "manifest.json"
+# manifest.json 안의 게시 메타데이터 키 (뷰 이름과 겹치지 않도록 '_' 로 시작)
+MANIFEST_META_KEY = "_meta"
+# reports/<name>.<hash>.json, reports/<name>/<date>.<hash>.json (일자 파티션), reports/<name>/index.<hash>.json
+HASHED_SNAPSHOT_PATTERN = re.compile(r"^reports/[A-Za-z0-9_]+(/[A-Za-z0-9_-]+)?\.[0-9a-f]{12}\.json$")
+PARTITION_INDEX_PREFIX = "index"
+
+
+def is_hashed_snapshot(filename):
+    """static/ 기준 경로가 콘텐츠 해시 스냅샷인지 (내용이 바뀌지 않으므로 영구 캐시 가능)"""
+    return HASHED_SNAPSHOT_PATTERN.match(filename) is not None
+
+
+def manifest_version(manifest, names=None):
+    """
+    manifest 가 가리키는 스냅샷/파티션 index 해시로 만든 버전 문자열 (names 가 있으면 해당 항목만).
+    DB 최종 수정 시각(SAVE_TIME)이 같아도 링크 발송 등으로 게시 내용이 바뀌면 함께 바뀝니다.
+    """
+    parts = sorted(
+        f"{name}:{entry.get('hash')}:{entry.get('index')}"
+        for name, entry in manifest.items() if name != MANIFEST_META_KEY and (names is None or name in names)
+    )
+    if not parts:
+        return None
+    return hashlib.sha1("|".join(parts).encode('utf-8')).hexdigest()[:12]
+
+
+def atomic_write(path, payload):
+    """임시 파일에 쓴 뒤 rename 으로 교체 (읽는 쪽에서 쓰다 만 파일을 볼 수 없음)"""
+    directory, basename = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{basename}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        # nginx 컨테이너에서도 읽을 수 있도록 (mkstemp 기본값은 0600)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def serialize(data):
+    """스냅샷 JSON 바이트와 콘텐츠 해시(앞 12자리)"""
+    payload = dumps_bytes(data)
+    return payload, hashlib.sha256(payload).hexdigest()[:12]
+
+
+def read_snapshot(folder, entry):
+    """
+    manifest 항목이 가리키는 해시 스냅샷을 읽어 JSON 객체로 반환.
+    파일이 없거나 내용 해시가 manifest 와 다르면(쓰다 만 파일, 수동 수정 등) None
+    """
+    if not entry:
+        return None
+    try:
+        with open(os.path.join(folder, entry["file"]), 'rb') as f:
+            payload = f.read()
+    except (OSError, KeyError):
+        return None
+    if hashlib.sha256(payload).hexdigest()[:12] != entry.get("hash"):
+        return None
+    try:
+        return loads_bytes(payload)
+    except ValueError:
+        return None
+
+
+def remove_with_sidecars(path):
+    for stale in (path, path + ".gz", path + ".br"):
+        if os.path.exists(stale):
+            os.remove(stale)
+
+
+def compress_sidecars(payload):
+    """nginx gzip_static / brotli_static 용 사전 압축본 ({확장자: bytes})"""
+    sidecars = {".gz": gzip.compress(payload, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        # quality 11 은 대용량 JSON 에서 수십 배 느리고 크기 이득이 없어 9 사용
+        sidecars[".br"] = brotli.compress(payload, quality=9)
+    return sidecars
+
+
+def write_with_sidecars(path, payload, sidecars=None):
+    """본 파일과 .gz/.br 사이드카를 원자적으로 기록 (사이드카를 먼저 써서 본 파일이 보이면 항상 함께 존재)"""
+    for suffix, compressed in (sidecars or compress_sidecars(payload)).items():
+        atomic_write(path + suffix, compressed)
+    atomic_write(path, payload)
+
+
+class StreamingSnapshotFile:
+    """
+    청크로 받은 JSON 을 임시 파일(본 파일 + .gz/.br)에 바로 쓰면서 sha256 을 계산합니다.
+    전체 payload 와 압축본을 메모리에 두지 않고, 해시를 안 뒤 install() 로 최종 경로에 원자적으로 옮깁니다.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.digest = hashlib.sha256()
+        self.size = 0
+        # 확장자 → (청크 압축, 마무리). wbits=31 은 gzip 헤더 (gzip.compress(mtime=0) 와 같은 형식)
+        gz = zlib.compressobj(9, zlib.DEFLATED, 31)
+        self._compressors = {".gz": (gz.compress, gz.flush)}
+        if brotli is not None:
+            br = brotli.Compressor(quality=9)
+            self._compressors[".br"] = (br.process, br.finish)
+        self._temps = {}
+        self._files = {}
+        try:
+            for suffix in [*self._compressors, ""]:
+                fd, self._temps[suffix] = tempfile.mkstemp(dir=directory, prefix=".snapshot.", suffix=suffix + ".tmp")
+                self._files[suffix] = os.fdopen(fd, 'wb')
+        except BaseException:
+            self.discard()
+            raise
+
+    def write(self, chunk):
+        self.digest.update(chunk)
+        self.size += len(chunk)
+        self._files[""].write(chunk)
+        for suffix, (compress, _) in self._compressors.items():
+            self._files[suffix].write(compress(chunk))
+
+    def close(self):
+        for suffix, (_, finish) in self._compressors.items():
+            self._files[suffix].write(finish())
+        for f in self._files.values():
+            f.close()
+        for tmp_path in self._temps.values():
+            os.chmod(tmp_path, 0o644)
+
+    def install(self, path):
+        """사이드카 먼저, 본 파일은 마지막에 교체. 같은 임시 파일을 여러 경로에 설치할 수 있도록 하드 링크로 옮김"""
+        for suffix in [*self._compressors, ""]:
+            target = path + suffix
+            fd, link_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=f".{os.path.basename(target)}.", suffix=".tmp")
+            os.close(fd)
+            os.remove(link_path)
+            try:
+                os.link(self._temps[suffix], link_path)
+            except OSError:
+                # 하드 링크를 지원하지 않는 파일시스템이면 복사
+                shutil.copyfile(self._temps[suffix], link_path)
+                os.chmod(link_path, 0o644)
+            os.replace(link_path, target)
+
+    def discard(self):
+        for f in self._files.values():
+            f.close()
+        for tmp_path in self._temps.values():
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+class SnapshotWriter:
+    """
+    레포트 JSON 스냅샷을 콘텐츠 해시 파일명(<name>.<hash>.json)으로 게시합니다.
+
+    - 모든 파일은 임시 파일 + rename 으로 원자적으로 교체됩니다.
+    - 해시 파일은 내용이 바뀌지 않으므로 nginx/브라우저가 영구 캐시할 수 있습니다.
+    - manifest.json 에 뷰 이름별 현재 파일명을 기록하며, 기존 <name>.json 도 함께 갱신합니다.
+      publish() 는 모든 뷰 파일을 쓴 뒤 메타데이터(DB 버전)와 함께 manifest 를 한 번만 교체합니다.
+    - 이전 해시 파일은 keep 개까지 남겨 로딩 중인 클라이언트가 깨지지 않도록 합니다.
+    - 일자별 파티션(<name>/<date>.<hash>.json)과 파티션 목록(<name>/index.<hash>.json)도 함께 게시합니다.
+      바뀐 일자만 다시 직렬화하므로 지난 일자 파일은 그대로 남아 영구 캐시되고, 페이지는 해시가 바뀐 파티션만 받습니다.
+    """
+
+    def __init__(self, folder, keep=3):
+        self.folder = folder
+        self.keep = keep
+        self._lock = threading.Lock()
+        self.manifest = self._load_manifest()
+        # 뷰 이름 → {일자: 파티션 항목} (마지막으로 게시한 index)
+        self._partitions = {}
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.folder, MANIFEST_FILENAME), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def meta(self):
+        """마지막으로 게시한 메타데이터 (시작 시에는 디스크의 manifest.json 에서 읽은 값)"""
+        return self.manifest.get(MANIFEST_META_KEY, {})
+
+    def load(self, name):
+        """마지막으로 게시한 스냅샷 JSON (웜 스타트용, 해시가 맞지 않으면 None)"""
+        return read_snapshot(self.folder, self.manifest.get(name))
+
+    def _write_snapshot(self, name, data, legacy=True):
+        """<name>.<hash>.json 과 <name>.json(legacy=True 일 때) 기록 후 manifest 항목 반환"""
+        started = time.perf_counter()
+        # 일자 단위 청크로 직렬화 + 압축하며 임시 파일에 바로 기록 (전체 문자열을 메모리에 만들지 않음)
+        snapshot = StreamingSnapshotFile(self.folder)
+        try:
+            for chunk in iter_json_chunks(data):
+                snapshot.write(chunk)
+            snapshot.close()
+            digest = snapshot.digest.hexdigest()[:12]
+            filename = f"{name}.{digest}.json"
+
+            path = os.path.join(self.folder, filename)
+            if os.path.exists(path):
+                os.utime(path)  # 정리 대상에서 제외되도록 최신으로 표시
+            else:
+                snapshot.install(path)
+            # 해시 파일명을 모르는 기존 클라이언트용
+            if legacy:
+                snapshot.install(os.path.join(self.folder, f"{name}.json"))
+        finally:
+            snapshot.discard()
+        SNAPSHOT_WRITE_BYTES.labels(name).observe(snapshot.size)
+        SNAPSHOT_WRITE_DURATION.labels(name).observe(time.perf_counter() - started)
+        return {"file": filename, "hash": digest, "bytes": snapshot.size}
+
+    def _write_hashed(self, filename, payload):
+        """해시 파일명 파일 기록 (이미 있으면 최신으로 표시만)"""
+        path = os.path.join(self.folder, filename)
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            write_with_sidecars(path, payload)
+
+    def _previous_partitions(self, name):
+        """마지막으로 게시한 파티션 항목 (리더가 바뀐 직후면 manifest 의 index 파일에서 읽음)"""
+        if name not in self._partitions:
+            self._partitions[name] = {}
+            index_file = (self.manifest.get(name) or {}).get("index")
+            if index_file:
+                try:
+                    with open(os.path.join(self.folder, index_file), encoding='utf-8') as f:
+                        self._partitions[name] = {entry["date"]: entry for entry in json.load(f)["partitions"]}
+                except (OSError, ValueError, KeyError):
+                    pass
+        return self._partitions[name]
+
+    def _write_partitions(self, name, data, changed_dates=None):
+        """
+        일자별 파티션과 index 기록 후 index 파일명 반환
+        :param changed_dates: 내용이 바뀐 일자 (None 이면 모든 일자를 직렬화해 해시 비교)
+        """
+        started = time.perf_counter()
+        os.makedirs(os.path.join(self.folder, name), exist_ok=True)
+        previous = self._previous_partitions(name)
+        partitions = {}
+        written = 0
+        for date, firms in data.items():
+            entry = previous.get(date)
+            if entry is None or changed_dates is None or date in changed_dates:
+                payload, digest = serialize(firms)
+                if entry is None or entry["hash"] != digest:
+                    entry = {"date": date, "file": f"{name}/{date}.{digest}.json", "hash": digest, "bytes": len(payload)}
+                    self._write_hashed(entry["file"], payload)
+                    written += len(payload)
+            partitions[date] = entry
+
+        # 파티션 순서는 전체 스냅샷의 일자 순서와 동일
+        index_payload, digest = serialize({"partitions": list(partitions.values())})
+        index_file = f"{name}/{PARTITION_INDEX_PREFIX}.{digest}.json"
+        self._write_hashed(index_file, index_payload)
+        self._partitions[name] = partitions
+        SNAPSHOT_WRITE_BYTES.labels(f"{name}/partitions").observe(written)
+        SNAPSHOT_WRITE_DURATION.labels(f"{name}/partitions").observe(time.perf_counter() - started)
+        return index_file
+
+    def _write_manifest(self, entries, meta=None):
+        with self._lock:
+            self.manifest.update(entries)
+            if meta is not None:
+                self.manifest[MANIFEST_META_KEY] = meta
+            manifest_payload = dumps_bytes(self.manifest)
+            write_with_sidecars(os.path.join(self.folder, MANIFEST_FILENAME), manifest_payload)
+
+    def write(self, name, data):
+        """스냅샷 하나를 기록하고 해시 파일명을 반환"""
+        entry = self._write_snapshot(name, data)
+        self._write_manifest({name: entry})
+        self._cleanup(name, entry["file"])
+        return entry["file"]
+
+    def publish(self, snapshots, meta, changed_dates=None, files=None):
+        """
+        여러 뷰를 기록한 뒤 manifest 를 한 번만 교체 (다른 워커는 항상 한 버전의 파일 묶음만 보게 됨)
+        :param snapshots: {뷰 이름: 데이터}
+        :param meta: manifest 에 함께 기록할 메타데이터 (예: {"last_modified": ...})
+        :param changed_dates: {뷰 이름: 바뀐 일자 집합} (없는 뷰는 모든 일자를 해시 비교)
+        :param files: {이름: 데이터} 일자 파티션/기존 파일명 없이 해시 파일만 게시할 데이터 (예: 글로벌 id 인덱스)
+        """
+        changed_dates = changed_dates or {}
+        entries = {}
+        for name, data in snapshots.items():
+            entries[name] = self._write_snapshot(name, data)
+            entries[name]["index"] = self._write_partitions(name, data, changed_dates.get(name))
+        for name, data in (files or {}).items():
+            entries[name] = self._write_snapshot(name, data, legacy=False)
+        self._write_manifest(entries, meta)
+        for name, entry in entries.items():
+            self._cleanup(name, entry["file"])
+            if name in snapshots:
+                self._cleanup_partitions(name)
+        return {name: entry["file"] for name, entry in entries.items()}
+
+    def _cleanup(self, name, current):
+        """오래된 해시 파일 정리 (최근 keep 개 유지)"""
+        snapshots = [
+            path for path in glob.glob(os.path.join(self.folder, f"{glob.escape(name)}.*.json"))
+            if os.path.basename(path).count('.') == 2
+        ]
+        snapshots.sort(key=os.path.getmtime, reverse=True)
+        for path in snapshots[self.keep:]:
+            if os.path.basename(path) == current:
+                continue
+            remove_with_sidecars(path)
+
+    def _cleanup_partitions(self, name):
+        """최근 keep 개 index 가 가리키지 않는 파티션과 오래된 index 정리"""
+        folder = os.path.join(self.folder, name)
+        indexes = glob.glob(os.path.join(folder, f"{PARTITION_INDEX_PREFIX}.*.json"))
+        indexes.sort(key=os.path.getmtime, reverse=True)
+        referenced = {f"{name}/{os.path.basename(path)}" for path in indexes[:self.keep]}
+        for path in indexes[:self.keep]:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    referenced.update(entry["file"] for entry in json.load(f)["partitions"])
+            except (OSError, ValueError, KeyError):
+                return  # 목록을 알 수 없으면 아무것도 지우지 않음
+        for path in glob.glob(os.path.join(folder, "*.json")):
+            if f"{name}/{os.path.basename(path)}" not in referenced:
+                remove_with_sidecars(path)
+
+
+class SnapshotManifest:
+    """
+    다른 워커(리더)가 게시한 manifest.json 을 읽는 쪽.
+
+    check_interval 초마다 파일 stat 만 확인하고, 바뀌었을 때만 다시 읽습니다.
+    manifest 는 원자적으로 교체되므로 항상 완전한 한 버전만 보입니다.
+    """
+
+    def __init__(self, folder, check_interval=1.0):
+        self.folder = folder
+        self.path = os.path.join(folder, MANIFEST_FILENAME)
+        self.check_interval = check_interval
+        self.manifest = {}
+        self._version = None
+        self._signature = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def current(self):
+        """최신 manifest (dict). 읽기 실패 시 마지막으로 읽은 값을 유지"""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self.manifest
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return self.manifest
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if signature != self._signature:
+                try:
+                    with open(self.path, encoding='utf-8') as f:
+                        manifest = json.load(f)
+                    self.manifest, self._version = manifest, manifest_version(manifest)
+                    self._signature = signature
+                except (OSError, ValueError):
+                    pass
+        return self.manifest
+
+    def url(self, name):
+        entry = self.current().get(name)
+        return f"/static/reports/{entry['file']}" if entry else None
+
+    def index_url(self, name):
+        """일자별 파티션 index 의 정적 URL (아직 없으면 None)"""
+        entry = self.current().get(name)
+        return f"/static/reports/{entry['index']}" if entry and entry.get("index") else None
+
+    def meta(self):
+        return self.current().get(MANIFEST_META_KEY, {})
+
+    def version(self, *names):
+        """게시된 파일 묶음의 버전 (manifest 항목 해시로 계산, 아직 게시 전이면 None). names 가 있으면 해당 항목만"""
+        manifest = self.current()
+        return manifest_version(manifest, names) if names else self._version
+
+    def load(self, name):
+        """현재 manifest 가 가리키는 스냅샷 JSON (해시가 맞지 않으면 None)"""
+        return read_snapshot(self.folder, self.current().get(name))
+
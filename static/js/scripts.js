@@ -9,12 +9,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const loadingElement = document.getElementById('loading');
 
     const isDailyGroup = window.location.pathname.includes('daily_group');
-    const jsonBaseUrl = isDailyGroup 
-        ? '/static/reports/daily_group_reports.json' 
-        : '/static/reports/recent_reports.json';
-
-    const timestamp = new Date().getTime();
-    const jsonUrl = `${jsonBaseUrl}?t=${timestamp}`;
+    const snapshotName = isDailyGroup ? 'daily_group_reports' : 'recent_reports';
 
     subtitleElement.textContent = isDailyGroup 
         ? '현재 메뉴: 일자별 레포트' 
@@ -23,22 +18,135 @@ document.addEventListener('DOMContentLoaded', () => {
     // 로딩 표시
     loadingElement.style.display = 'block';
 
-    fetch(jsonUrl)
-        .then(response => {
+    // 페이지에 표시된 레포트 id (SSE 로 받은 레포트 중복 표시 방지)
+    const seenIds = new Set();
+    let maxSeenId = 0;
+    let eventSource = null;
+
+    // SSE 를 쓸 수 없으면(서버가 피드를 끔/브라우저 미지원) manifest 를 주기적으로 확인해 바뀐 스냅샷만 다시 받음
+    const POLL_INTERVAL = 60 * 1000;
+    let pollTimer = null;
+    let currentSnapshotUrl = null;
+
+    // 파티션 해시 → 데이터 (다시 불러올 때 해시가 바뀐 일자만 받음)
+    const partitionCache = new Map();
+
+    loadReports(document.body.dataset.indexUrl, document.body.dataset.snapshotUrl);
+
+    function loadReports(embeddedIndexUrl, embeddedUrl) {
+        resolveSnapshotUrls(snapshotName, embeddedIndexUrl, embeddedUrl)
+            .then(({ indexUrl, snapshotUrl }) => {
+                currentSnapshotUrl = indexUrl || snapshotUrl;
+                return indexUrl ? fetchPartitions(indexUrl) : fetchJson(snapshotUrl);
+            })
+            .then(data => {
+                renderReports(data);
+                subscribeReports();
+            })
+            .catch(error => {
+                console.error('JSON 데이터를 가져오는 중 오류 발생:', error);
+                reportContainer.innerHTML = '<p>데이터를 가져오는 데 실패했습니다.</p>';
+            })
+            .finally(() => {
+                // 로딩 메시지 숨기기
+                loadingElement.style.display = 'none';
+            });
+    }
+
+    function fetchJson(url) {
+        return fetch(url).then(response => {
             if (!response.ok) throw new Error('네트워크 응답에 문제가 있습니다.');
             return response.json();
-        })
-        .then(data => {
-            renderReports(data);
-        })
-        .catch(error => {
-            console.error('JSON 데이터를 가져오는 중 오류 발생:', error);
-            reportContainer.innerHTML = '<p>데이터를 가져오는 데 실패했습니다.</p>';
-        })
-        .finally(() => {
-            // 로딩 메시지 숨기기
-            loadingElement.style.display = 'none';
         });
+    }
+
+    // 일자별 파티션 index 를 받아 해시가 바뀐 파티션만 새로 받고 { 일자: { 증권사: [...] } } 로 합침
+    function fetchPartitions(indexUrl) {
+        return fetchJson(indexUrl).then(index => Promise.all(index.partitions.map(partition => {
+            if (partitionCache.has(partition.hash)) return partitionCache.get(partition.hash);
+            return fetchJson(`/static/reports/${partition.file}`).then(firms => {
+                partitionCache.set(partition.hash, firms);
+                return firms;
+            });
+        })).then(partitions => {
+            const hashes = new Set(index.partitions.map(partition => partition.hash));
+            Array.from(partitionCache.keys()).forEach(hash => {
+                if (!hashes.has(hash)) partitionCache.delete(hash);
+            });
+
+            const data = {};
+            index.partitions.forEach((partition, i) => {
+                data[partition.date] = partitions[i];
+            });
+            return data;
+        }));
+    }
+
+    // 새로 저장된 레포트만 SSE 로 받아 해당 일자/증권사 그룹 맨 위에 추가
+    function subscribeReports() {
+        if (pollTimer) return;
+        if (!window.EventSource) {
+            startPolling();
+            return;
+        }
+        if (eventSource) eventSource.close();
+
+        eventSource = new EventSource(`/reports/stream?last_id=${maxSeenId}`);
+        eventSource.addEventListener('reports', event => {
+            JSON.parse(event.data).forEach(report => {
+                // 이미 표시한 레포트(링크 발송 등 후속 변경)는 기존 항목의 링크/제목만 갱신
+                if (seenIds.has(report.id)) {
+                    updateReportElement(report);
+                    return;
+                }
+                const date = isDailyGroup ? report.reg_dt : report.save_date;
+                const companyGroup = ensureCompanyGroup(ensureDateGroup(date), report.firm);
+                companyGroup.insertBefore(createReportElement(report), companyGroup.children[1] || null);
+                companyGroup.parentNode.insertBefore(companyGroup, companyGroup.parentNode.children[1] || null);
+            });
+        });
+        // 놓친 레포트가 너무 많으면 서버가 reset 을 보냄 → 최신 스냅샷을 다시 받아 렌더링
+        eventSource.addEventListener('reset', () => {
+            eventSource.close();
+            eventSource = null;
+            loadReports(null, null);
+        });
+        // 204(피드 꺼짐) 등 200 이 아닌 응답이면 브라우저가 재접속하지 않고 닫음 → 폴링으로 전환
+        // (동시 구독 수 초과는 서버가 200 + retry 로 닫으므로 브라우저가 나중에 다시 접속)
+        eventSource.addEventListener('error', () => {
+            if (!eventSource || eventSource.readyState !== EventSource.CLOSED) return;
+            eventSource = null;
+            startPolling();
+        });
+    }
+
+    function startPolling() {
+        if (pollTimer) return;
+        pollTimer = setInterval(() => {
+            resolveSnapshotUrls(snapshotName, null, null)
+                .then(({ indexUrl, snapshotUrl }) => {
+                    if ((indexUrl || snapshotUrl) !== currentSnapshotUrl) loadReports(indexUrl, snapshotUrl);
+                })
+                .catch(error => console.error('스냅샷 확인 중 오류 발생:', error));
+        }, POLL_INTERVAL);
+    }
+
+    // 콘텐츠 해시 파일명은 내용이 바뀌면 URL 도 바뀌므로 캐시 버스터(?t=) 없이 그대로 캐시 가능
+    function resolveSnapshotUrls(name, embeddedIndexUrl, embeddedUrl) {
+        if (embeddedIndexUrl || embeddedUrl) {
+            return Promise.resolve({ indexUrl: embeddedIndexUrl, snapshotUrl: embeddedUrl });
+        }
+
+        return fetch('/static/reports/manifest.json', { cache: 'no-cache' })
+            .then(response => response.ok ? response.json() : {})
+            .then(manifest => {
+                const entry = manifest[name];
+                return {
+                    indexUrl: entry && entry.index ? `/static/reports/${entry.index}` : null,
+                    snapshotUrl: entry ? `/static/reports/${entry.file}` : `/static/reports/${name}.json`,
+                };
+            });
+    }
 
     function renderReports(data) {
         reportContainer.innerHTML = ''; 
@@ -54,45 +162,83 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     
         // 렌더링
+        seenIds.clear();
         sortedData.forEach(([date, firms]) => {
-            const dateGroup = document.createElement('div');
-            dateGroup.className = 'date-group';
-    
-            const dateTitle = document.createElement('div');
-            dateTitle.className = 'date-title';
-            dateTitle.textContent = date;
-            dateGroup.appendChild(dateTitle);
-    
+            const dateGroup = ensureDateGroup(date);
             Object.entries(firms).forEach(([firm, reports]) => {
-                const companyGroup = document.createElement('div');
-                companyGroup.className = 'company-group';
-    
-                const companyTitle = document.createElement('div');
-                companyTitle.className = 'company-title';
-                companyTitle.textContent = firm;
-                companyGroup.appendChild(companyTitle);
-    
+                const companyGroup = ensureCompanyGroup(dateGroup, firm);
                 reports.forEach(report => {
-                    const reportElement = document.createElement('div');
-                    reportElement.className = 'report';
-    
-                    const reportLink = document.createElement('a');
-                    reportLink.href = report.link;
-                    reportLink.target = '_blank';
-                    reportLink.textContent = report.title;
-    
-                    const reportWriter = document.createElement('p');
-                    reportWriter.textContent = `작성자: ${report.writer}`;
-    
-                    reportElement.appendChild(reportLink);
-                    reportElement.appendChild(reportWriter);
-                    companyGroup.appendChild(reportElement);
+                    companyGroup.appendChild(createReportElement(report));
                 });
-    
-                dateGroup.appendChild(companyGroup);
             });
-    
-            reportContainer.appendChild(dateGroup);
         });
+    }
+
+    // 일자 그룹 (없으면 내림차순 위치에 새로 생성)
+    function ensureDateGroup(date) {
+        const dateGroups = reportContainer.querySelectorAll('.date-group');
+        for (const group of dateGroups) {
+            if (group.dataset.date === date) return group;
+        }
+
+        const dateGroup = document.createElement('div');
+        dateGroup.className = 'date-group';
+        dateGroup.dataset.date = date;
+
+        const dateTitle = document.createElement('div');
+        dateTitle.className = 'date-title';
+        dateTitle.textContent = date;
+        dateGroup.appendChild(dateTitle);
+
+        const nextGroup = Array.from(dateGroups).find(group => group.dataset.date < date);
+        reportContainer.insertBefore(dateGroup, nextGroup || null);
+        return dateGroup;
+    }
+
+    // 일자 그룹 안의 증권사 그룹 (없으면 끝에 새로 생성)
+    function ensureCompanyGroup(dateGroup, firm) {
+        for (const group of dateGroup.querySelectorAll('.company-group')) {
+            if (group.dataset.firm === firm) return group;
+        }
+
+        const companyGroup = document.createElement('div');
+        companyGroup.className = 'company-group';
+        companyGroup.dataset.firm = firm;
+
+        const companyTitle = document.createElement('div');
+        companyTitle.className = 'company-title';
+        companyTitle.textContent = firm;
+        companyGroup.appendChild(companyTitle);
+
+        dateGroup.appendChild(companyGroup);
+        return companyGroup;
+    }
+
+    function createReportElement(report) {
+        seenIds.add(report.id);
+        maxSeenId = Math.max(maxSeenId, report.id);
+
+        const reportElement = document.createElement('div');
+        reportElement.className = 'report';
+        reportElement.dataset.id = report.id;
+
+        const reportLink = document.createElement('a');
+        reportLink.href = report.link;
+        reportLink.target = '_blank';
+        reportLink.textContent = report.title;
+
+        const reportWriter = document.createElement('p');
+        reportWriter.textContent = `작성자: ${report.writer}`;
+
+        reportElement.appendChild(reportLink);
+        reportElement.appendChild(reportWriter);
+        return reportElement;
+    }
+
+    function updateReportElement(report) {
+        const reportLink = document.querySelector(`.report[data-id="${report.id}"] a`);
+        if (!reportLink) return;
+        reportLink.href = report.link;
+        reportLink.textContent = report.title;
     }    
 });
\ No newline at end of file
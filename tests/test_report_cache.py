@@ -0,0 +1,120 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+# model.SQLiteManager 는 import 시 SQLITE_PATH 로 기본 풀을 만들므로 먼저 지정 (테스트는 별도 풀 사용)
+os.environ.setdefault("SQLITE_PATH", os.path.join(tempfile.gettempdir(), "docker-flask-test.db"))
+
+from bench.synthetic_data import create_table
+from model.SQLiteConnectionPool import SQLiteConnectionPool
+from model.SQLiteManager import SQLiteManagerSQL
+from service.ReportCache import IncrementalGroupedCache, ReportSnapshotBuilder
+from service.ReportTransform import save_time_date, reg_dt_date, is_global_report, report_json_default
+
+
+def make_views():
+    """app.py 와 같은 세 레포트 뷰"""
+    return {
+        "recent_reports": IncrementalGroupedCache(save_time_date, days_before=3),
+        "daily_group_reports": IncrementalGroupedCache(reg_dt_date, days_before=3),
+        "daily_global_reports": IncrementalGroupedCache(save_time_date, days_before=14, row_filter=is_global_report),
+    }
+
+
+def to_json(view):
+    """게시되는 스냅샷 JSON 과 같은 형태 ({일자: {증권사: [항목]}})"""
+    return json.loads(json.dumps(view.data, default=report_json_default))
+
+
+class ReportCacheReconcileTest(unittest.TestCase):
+    """증분 갱신으로 보이지 않는 변경(링크가 있는 행 수정, 행 삭제)이 재조정 후 전체 재조회 결과와 같아지는지 확인"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "reports.db")
+        create_table(self.db_path, rows=3000, days=20)
+        self.pool = SQLiteConnectionPool(self.db_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def refresh(self, builder):
+        db = SQLiteManagerSQL(self.pool)
+        try:
+            return builder.refresh(db)
+        finally:
+            db.close_connection()
+
+    def full_rebuild(self):
+        builder = ReportSnapshotBuilder(make_views())
+        self.refresh(builder)
+        return {name: to_json(view) for name, view in builder.views.items()}
+
+    def mutate(self):
+        """최근 링크가 있는 행 하나의 링크/제목을 바꾸고 다른 하나를 삭제. (수정 id, 삭제 id) 반환"""
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            changed_id, deleted_id = [row[0] for row in conn.execute(
+                "SELECT id FROM data_main_daily_send WHERE TELEGRAM_URL != '' ORDER BY id DESC LIMIT 2"
+            )]
+            conn.execute(
+                "UPDATE data_main_daily_send SET TELEGRAM_URL = ?, ARTICLE_TITLE = ? WHERE id = ?",
+                ("https://t.me/report/edited", "수정된 제목", changed_id),
+            )
+            conn.execute("DELETE FROM data_main_daily_send WHERE id = ?", (deleted_id,))
+        conn.close()
+        return changed_id, deleted_id
+
+    def find(self, snapshot, row_id):
+        for firms in snapshot.values():
+            for items in firms.values():
+                for item in items:
+                    if item["id"] == row_id:
+                        return item
+        return None
+
+    def test_reconcile_picks_up_changed_link_and_deleted_row(self):
+        builder = ReportSnapshotBuilder(make_views(), reconcile_interval=3600)
+        self.refresh(builder)
+        changed_id, deleted_id = self.mutate()
+
+        # 재조정 주기 전 증분 갱신은 새 행/pending 행만 보므로 그대로
+        self.refresh(builder)
+        recent = to_json(builder.views["recent_reports"])
+        self.assertNotEqual(self.find(recent, changed_id)["link"], "https://t.me/report/edited")
+        self.assertIsNotNone(self.find(recent, deleted_id))
+
+        builder._reconcile_at = 0.0
+        self.assertTrue(builder.needs_refresh())
+        changed = self.refresh(builder)
+        self.assertIn("recent_reports", changed)
+        recent = to_json(builder.views["recent_reports"])
+        self.assertEqual(self.find(recent, changed_id)["link"], "https://t.me/report/edited")
+        self.assertEqual(self.find(recent, changed_id)["title"], "수정된 제목")
+        self.assertIsNone(self.find(recent, deleted_id))
+        self.assertEqual({name: to_json(view) for name, view in builder.views.items()}, self.full_rebuild())
+
+        # 바뀐 것이 없으면 재조정해도 다시 게시하지 않음
+        builder._reconcile_at = 0.0
+        self.assertEqual(self.refresh(builder), [])
+
+    def test_warm_start_does_not_republish_deleted_row(self):
+        builder = ReportSnapshotBuilder(make_views())
+        self.refresh(builder)
+        snapshots = {name: to_json(view) for name, view in builder.views.items()}
+        state = json.loads(json.dumps(builder.state()))
+        changed_id, deleted_id = self.mutate()
+
+        restored = ReportSnapshotBuilder(make_views())
+        self.assertTrue(restored.restore(snapshots, state))
+        self.assertTrue(restored.needs_refresh())
+        self.refresh(restored)
+        self.assertFalse(any(view.restored for view in restored.views.values()))
+        self.assertEqual({name: to_json(view) for name, view in restored.views.items()}, self.full_rebuild())
+
+
+if __name__ == "__main__":
+    unittest.main()